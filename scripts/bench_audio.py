@@ -0,0 +1,81 @@
+"""Benchmark cost of the per-sample audio callback (`retro_audio_sample`).
+
+Usage:
+    python scripts/bench_audio.py [core rom]
+
+Without arguments the callbacks are invoked through ctypes 800 times per "frame" (one frame of 48kHz audio at 60 fps).
+This includes the foreign call from python, the native call of the no-op is the baseline for it.
+With a core and rom, whole frames of `frame_advance` are timed instead.
+"""
+
+import logging
+import sys
+import timeit
+
+from retropy import RetroPy
+from retropy.core import callbacks as cb
+from retropy.utils.audio import AudioBuffer
+
+SAMPLES = 800
+
+
+class MethodRetroPy(RetroPy):
+    """Previous behaviour: bound method with logging per sample."""
+
+    def audio_sample(self, left: int, right: int) -> None:
+        logging.debug("Callback: audio_sample")
+
+        self.audio.write_sample(left, right)
+
+
+def bench_callbacks():
+    audio = AudioBuffer()
+
+    def method(left: int, right: int):
+        logging.debug("Callback: audio_sample")
+        audio.write_sample(left, right)
+
+    callbacks = {
+        "method + ring": cb.audio_sample_t(method),
+        "sample_writer": cb.audio_sample_t(audio.sample_writer()),
+        "native no-op": cb.audio_sample_noop,
+    }
+
+    for name, callback in callbacks.items():
+
+        def frame():
+            for i in range(SAMPLES):
+                callback(i, -i)
+            audio.flush()
+
+        seconds = min(timeit.repeat(frame, number=20, repeat=5)) / 20
+        print(f"{name:<16} {seconds * 1e6:10.1f} us/frame")
+
+
+def bench_core(core_path: str, rom: str):
+    variants = {
+        "method + ring": lambda: MethodRetroPy(core_path),
+        "sample_writer": lambda: RetroPy(core_path),
+        "native no-op": lambda: RetroPy(core_path, capture_audio=False),
+    }
+
+    for name, create in variants.items():
+        core = create()
+        core.load(rom)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        for _ in range(60):
+            core.frame_advance()
+
+        seconds = min(timeit.repeat(core.frame_advance, number=60, repeat=5)) / 60
+        print(f"{name:<16} {seconds * 1e6:10.1f} us/frame")
+
+        core.unload()
+        logging.getLogger().setLevel(logging.INFO)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        bench_core(sys.argv[1], sys.argv[2])
+    else:
+        bench_callbacks()
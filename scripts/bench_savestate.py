@@ -0,0 +1,92 @@
+"""Benchmark encoding / decoding of delta savestates (`DeltaSavestate`).
+
+Usage:
+    python scripts/bench_savestate.py [core rom]
+
+Without arguments synthetic 4 MiB states are used, where a fraction of bytes changes between base and state.
+With a core and rom, the state after a number of frames is encoded against the state before them.
+Full copies and zlib compression of the same state are listed for comparison.
+"""
+
+import logging
+import sys
+import timeit
+import zlib
+
+import numpy as np
+
+from retropy import RetroPy
+from retropy.utils.savestate import DeltaSavestate, Savestate
+
+SIZE = 4 << 20
+
+
+def state_of(array: np.ndarray) -> Savestate:
+    state = Savestate(len(array))
+    np.frombuffer(state.buffer, dtype=np.uint8)[:] = array
+    return state
+
+
+def bench(name: str, state: Savestate, base: Savestate):
+    scratch = Savestate(state.size.value)
+    delta = DeltaSavestate(state, base)
+
+    encode = min(timeit.repeat(lambda: DeltaSavestate(state, base), number=10)) / 10
+    decode = min(timeit.repeat(lambda: delta.decode(into=scratch), number=10)) / 10
+
+    def copy_state():
+        scratch.buffer[:] = state.buffer
+
+    copy = min(timeit.repeat(copy_state, number=10)) / 10
+    compressed = len(zlib.compress(state.buffer, 1))
+
+    assert bytes(delta.decode().buffer) == bytes(state.buffer)
+
+    print(
+        f"{name:<14} {state.size.value / 1024:9.0f} KiB"
+        f" | delta {delta.nbytes / 1024:9.1f} KiB ({len(delta):6} runs)"
+        f" encode {encode * 1e3:7.2f} ms decode {decode * 1e3:7.2f} ms"
+        f" | copy {copy * 1e3:6.2f} ms | zlib-1 {compressed / 1024:9.1f} KiB"
+    )
+
+
+def bench_synthetic():
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, SIZE, dtype=np.uint8)
+
+    for fraction in (0.001, 0.01, 0.05):
+        current = base.copy()
+
+        # Changes are clustered like game variables in RAM
+        starts = rng.integers(0, SIZE - 16, int(SIZE * fraction / 8))
+        for offset in range(8):
+            current[starts + offset] ^= rng.integers(
+                1, 256, len(starts), dtype=np.uint8
+            )
+
+        bench(f"{fraction:.1%} changed", state_of(current), state_of(base))
+
+
+def bench_core(core_path: str, rom: str):
+    core = RetroPy(core_path)
+    core.load(rom)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for _ in range(60):
+        core.frame_advance(render=False, audio=False)
+
+    base = core.save_state()
+    for frames in (1, 10, 60):
+        for _ in range(frames):
+            core.frame_advance(render=False, audio=False)
+
+        bench(f"{frames} frames", core.save_state(), base)
+
+    core.unload()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        bench_core(sys.argv[1], sys.argv[2])
+    else:
+        bench_synthetic()
@@ -1,4 +1,6 @@
+import sys
 from ctypes import *
+from ctypes.util import find_library
 
 environment_t = CFUNCTYPE(c_bool, c_uint, c_void_p)
 """retro_environment_t"""
@@ -12,6 +14,14 @@ audio_sample_t = CFUNCTYPE(None, c_int16, c_int16)
 audio_sample_batch_t = CFUNCTYPE(c_size_t, POINTER(c_int16), c_size_t)
 """retro_audio_sample_batch_t"""
 
+# A python callback would take the GIL and enter the interpreter for every sample.
+# Instead the C runtime's `abs(int)` is used as native no-op: it is pure and its result is discarded.
+# With the C calling convention the caller removes arguments, so the ignored `right` sample is harmless.
+_libc = cdll.msvcrt if sys.platform == "win32" else CDLL(find_library("c"))
+
+audio_sample_noop = cast(_libc.abs, audio_sample_t)
+"""Native retro_audio_sample_t ignoring all samples. Never enters the interpreter."""
+
 input_poll_t = CFUNCTYPE(None)
 """retro_input_poll_t"""
 
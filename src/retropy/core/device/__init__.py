@@ -7,11 +7,11 @@ class Device(IntEnum):
 
     NONE = 0
     JOYPAD = 1
-    # MOUSE = 2
-    # KEYBOARD = 3
-    # LIGHTGUN = 4
+    MOUSE = 2
+    KEYBOARD = 3
+    LIGHTGUN = 4
     ANALOG = 5
-    # POINTER = 6
+    POINTER = 6
 
 
 class Joypad(IntEnum):
@@ -33,12 +33,11 @@ class Joypad(IntEnum):
     R2 = 13
     L3 = 14
     R3 = 15
-    # MASK = 256
+    MASK = 256
 
 
-"""
 class Mouse(IntEnum):
-    # RETRO_DEVICE_ID_
+    """RETRO_DEVICE_ID_MOUSE_"""
 
     X = 0
     Y = 1
@@ -51,7 +50,34 @@ class Mouse(IntEnum):
     HORIZ_WHEELDOWN = 8
     BUTTON_4 = 9
     BUTTON_5 = 10
-"""
+
+
+class Lightgun(IntEnum):
+    """RETRO_DEVICE_ID_LIGHTGUN_"""
+
+    SCREEN_X = 13
+    SCREEN_Y = 14
+    IS_OFFSCREEN = 15
+    TRIGGER = 2
+    RELOAD = 16
+    AUX_A = 3
+    AUX_B = 4
+    START = 6
+    SELECT = 7
+    AUX_C = 8
+    DPAD_UP = 9
+    DPAD_DOWN = 10
+    DPAD_LEFT = 11
+    DPAD_RIGHT = 12
+
+
+class Pointer(IntEnum):
+    """RETRO_DEVICE_ID_POINTER_"""
+
+    X = 0
+    Y = 1
+    PRESSED = 2
+    COUNT = 3
 
 
 class AnalogIdx(IntEnum):
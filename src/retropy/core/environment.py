@@ -1,5 +1,5 @@
 from ctypes import *
-from enum import IntEnum
+from enum import IntEnum, IntFlag
 
 EXPERIMENTAL = 0x10000
 PRIVATE = 0x20000
@@ -98,3 +98,24 @@ class CoreVariable(Structure):
 
     key: bytes
     value: bytes
+
+
+class AvEnable(IntFlag):
+    """Bits of RETRO_ENVIRONMENT_GET_AUDIO_VIDEO_ENABLE"""
+
+    VIDEO = 1 << 0
+    AUDIO = 1 << 1
+    FAST_SAVESTATES = 1 << 2
+    HARD_DISABLE_AUDIO = 1 << 3
+
+
+class SerializationQuirks(IntFlag):
+    """RETRO_SERIALIZATION_QUIRK_ (SET_SERIALIZATION_QUIRKS)"""
+
+    INCOMPLETE = 1 << 0
+    MUST_INITIALIZE = 1 << 1
+    CORE_VARIABLE_SIZE = 1 << 2
+    FRONT_VARIABLE_SIZE = 1 << 3
+    SINGLE_SESSION = 1 << 4
+    ENDIAN_DEPENDENT = 1 << 5
+    PLATFORM_DEPENDENT = 1 << 6
@@ -20,7 +20,7 @@ class MEMORY_ACCESS(IntFlag):
 class MEMORY_TYPE(IntFlag):
     """RETRO_MEMORY_TYPE_"""
 
-    MEMORY_TYPE = 1 << 0
+    CACHED = 1 << 0
 
 
 class Framebuffer(Structure):
@@ -31,7 +31,7 @@ class Framebuffer(Structure):
         ("width", c_uint),
         ("height", c_uint),
         ("pitch", c_size_t),
-        ("fromat", c_int32),
+        ("format", c_int32),
         ("access_flags", c_uint),
         ("memory_flags", c_uint),
     ]
@@ -40,6 +40,6 @@ class Framebuffer(Structure):
     width: int
     height: int
     pitch: int
-    fromat: int
+    format: int
     access_flags: int
     memory_flags: int
@@ -8,16 +8,27 @@ from ctypes import *
 
 import logging
 from pathlib import Path
-from typing import Callable, Sequence
+from typing import Callable, Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 from . import callbacks as cb
-from .renderer.framebuffer import PixelFormat
+from .renderer.framebuffer import PixelFormat, Framebuffer, MEMORY_ACCESS, MEMORY_TYPE
 from .os.localization import Region
 from .os.system import SystemInfo, SystemAvInfo
 from .game import GameInfo
-from .environment import EnvironmentCommand, CoreVariable
-from .device import InputDescriptor
+from .environment import (
+    EnvironmentCommand,
+    CoreVariable,
+    AvEnable,
+    SerializationQuirks,
+)
+from .device import InputDescriptor, Device
 from .device.controller import ControllerInfo
+from .device.keyboard import KeyboardCallback
 from .performance import perf
 from .log import LogCallback, log_printf_t
 from .options import (
@@ -28,9 +39,13 @@ from .options import (
 from .memory import MemoryMap, MemoryRegion
 
 
-from ..utils.savestate import Savestate
-from ..utils.video import buffer_to_frame, Frame
-from ..utils.input import InputDevice, GamePad
+from ..utils.savestate import Savestate, SavestatePool
+from ..utils.video import buffer_to_frame, Frame, FrameLayout
+from ..utils.preprocessing import FramePreprocessing
+from ..utils.recorder import VideoRecorder
+from ..utils.audio import AudioBuffer, Audio
+from ..utils.movie import MovieRecorder, MoviePlayer, recorded_device
+from ..utils.input import InputDevice, GamePad, Keyboard, Mouse, Lightgun, Pointer
 from ..utils.exceptions import InvalidRomError, SavestateError
 from ..utils.ptr_array import foreach
 from ..utils.memory import RAM, InternalMemory
@@ -48,13 +63,23 @@ class RetroPy:
         memory (RAM): memory
     """
 
-    pixel_format: PixelFormat
-    core_variables: dict[bytes, dict[str, bytes | Sequence[bytes]]] = {}
+    pixel_format: PixelFormat = PixelFormat.RGB1555  # libretro default
+    core_variables: dict[bytes, dict[str, bytes | Sequence[bytes]]]
+    """Options declared by the core (per instance)."""
     # frontend_options: dict[str, Any] = {}
-    controllers: list[InputDevice] = []
-
-    last_frame: Frame = None
-    """Last video frame returned by `video_refresh` callback."""
+    controllers: list[InputDevice]
+    """Input device of every port (per instance)."""
+    controller_info: list[list[tuple[int, bytes]]]
+    """Device types (id, description) accepted by every port, declared by `SET_CONTROLLER_INFO`."""
+
+    device_types: dict[int, type[InputDevice]] = {
+        Device.JOYPAD: GamePad,
+        Device.ANALOG: GamePad,
+        Device.MOUSE: Mouse,
+        Device.LIGHTGUN: Lightgun,
+        Device.POINTER: Pointer,
+    }
+    """Input device created by `set_controller` for a libretro device type. Unknown types get an idle `InputDevice`."""
 
     loaded: bool = False
     """Whether a game is loaded."""
@@ -62,6 +87,24 @@ class RetroPy:
     memory: RAM
     """Cores memory / RAM. Only available if game is `loaded`."""
 
+    frame_is_dupe: bool = False
+    """Whether the core reported the last frame as unchanged (`last_frame` was reused as is)."""
+
+    frame_layout: FrameLayout = FrameLayout.HWC
+    """Memory layout of converted frames. Anything other than `HWC` requires numpy."""
+
+    frame_bottom_up: bool = False
+    """Whether converted frames store the last row first (numpy only)."""
+
+    preprocessing: FramePreprocessing = None
+    """Preprocessing applied while converting frames (numpy only). Takes precedence over `frame_layout`. None returns full frames."""
+
+    recorder: VideoRecorder = None
+    """Receives every rendered frame (including dupes) to write it in the background. None disables recording."""
+
+    movie: MovieRecorder | MoviePlayer = None
+    """Records or replays the controller state of every input poll. None disables movies."""
+
     cheats: CheatManager
     """Add cheats to currently loaded game.
     
@@ -69,14 +112,53 @@ class RetroPy:
 
     # region magic methods / (de)init
 
-    def __init__(self, path: str, numpy: bool = True) -> None:
+    def __init__(
+        self,
+        path: str,
+        numpy: bool = True,
+        lazy: bool = False,
+        capture_audio: bool = True,
+    ) -> None:
         """Loads needed shared object and initializes the libretro core
 
         Args:
             path (str): Path to valid core / shared object
+            numpy (bool, optional): If frames should be numpy arrays instead of flat `bytearray`. Defaults to True.
+            lazy (bool, optional): Only copy the raw framebuffer in `video_refresh` and convert it once `last_frame` is read. `frame_advance` returns None in this mode. Defaults to False.
+            capture_audio (bool, optional): Store audio in `audio`. If False, single samples are discarded by a native function without entering python, batches are dropped. Defaults to True.
         """
         self.path = Path(path).resolve()
         self.numpy = numpy
+        self.lazy = lazy
+        self.capture_audio = capture_audio
+
+        # Input / options state is per instance, so multiple cores can run side by side
+        self.core_variables = {}
+        self.controllers = []
+        self.controller_info = []
+        self.keyboard = Keyboard()
+
+        # Video frame state (see `last_frame`)
+        self.__last_frame: Frame = None
+        self.__raw_frame: Array[c_ubyte] = None
+        self.__raw_data: Array[c_ubyte] | np.ndarray = None
+        self.__raw_shape: tuple[int, int, int] = None
+        self.__raw_format: PixelFormat = None
+        self.__frame_pending = False
+
+        # Frontend owned framebuffer (see GET_CURRENT_SOFTWARE_FRAMEBUFFER)
+        self.software_framebuffer: np.ndarray = None
+        self.__software_framebuffer_address: int = None
+
+        # Reported to core by GET_AUDIO_VIDEO_ENABLE, set per frame by `frame_advance`
+        self.av_enable = AvEnable.VIDEO | AvEnable.AUDIO
+
+        # Captured audio (see `last_audio` / `drain_audio`)
+        self.audio = AudioBuffer()
+
+        # Declared by SET_SERIALIZATION_QUIRKS, `serialize_size` is cached unless the size varies
+        self.serialization_quirks = SerializationQuirks(0)
+        self.__serialize_size: int = None
 
         # Load core dll
         self.core = cdll.LoadLibrary(self.path)
@@ -105,7 +187,8 @@ class RetroPy:
         self.core.retro_get_system_info.restype = None
         self.core.retro_get_system_av_info.argtypes = [POINTER(SystemAvInfo)]
         self.core.retro_get_system_av_info.restype = None
-        # retro_set_controller_port_device
+        self.core.retro_set_controller_port_device.argtypes = [c_uint, c_uint]
+        self.core.retro_set_controller_port_device.restype = None
         self.core.retro_reset.argtypes = None
         self.core.retro_reset.restype = None
         self.core.retro_run.argtypes = None
@@ -218,7 +301,7 @@ class RetroPy:
         # Create callback objects (and keep them in scope)
         self.__cb_env = cb.environment_t(self.environment)
         self.__cb_video = cb.video_refresh_t(self.video_refresh)
-        self.__cb_audio = cb.audio_sample_t(self.audio_sample)
+        self.__cb_audio = cb.audio_sample_t(self.__audio_sample_callback())
         self.__cb_audio_batch = cb.audio_sample_batch_t(self.audio_sample_batch)
         self.__cb_input_poll = cb.input_poll_t(self.input_poll)
         self.__cb_input_state = cb.input_state_t(self.input_state)
@@ -226,7 +309,7 @@ class RetroPy:
         # Register callbacks
         self.core.retro_set_environment(self.__cb_env)
         self.core.retro_set_video_refresh(self.__cb_video)
-        self.core.retro_set_audio_sample(self.__cb_audio)
+        self.__install_audio_sample(self.capture_audio)
         self.core.retro_set_audio_sample_batch(self.__cb_audio_batch)
         self.core.retro_set_input_poll(self.__cb_input_poll)
         self.core.retro_set_input_state(self.__cb_input_state)
@@ -286,23 +369,95 @@ class RetroPy:
         self.core.retro_get_system_av_info(byref(info))
         return info
 
+    @property
+    def last_frame(self) -> Frame:
+        """Last video frame returned by `video_refresh` callback.
+
+        The buffer is reused and overwritten in place by every following frame as long as the geometry stays the same.
+        In `lazy` mode the frame is converted on first access.
+        """
+        if self.__frame_pending:
+            self.__frame_pending = False
+            self.__convert_frame(self.__raw_data, self.__raw_shape, self.__raw_format)
+
+        return self.__last_frame
+
+    @property
+    def last_audio(self) -> Audio:
+        """Audio frames emitted during the last `frame_advance` (`N x 2` int16).
+
+        View into the ring buffer of `audio`, valid until the next frame.
+        """
+        return self.audio.last()
+
+    def drain_audio(self) -> Audio:
+        """Take all audio frames emitted since the previous call (e.g. over multiple skipped frames).
+
+        Returns:
+            Audio: `N x 2` int16 view into the ring buffer of `audio`, valid until the next frame
+        """
+        return self.audio.drain()
+
+    def __convert_frame(
+        self, data, shape: tuple[int, int, int], format: PixelFormat
+    ) -> None:
+        """Convert raw framebuffer into `last_frame`. Writes into the previous frame if possible."""
+        if self.preprocessing:
+            self.__last_frame = self.preprocessing.apply(
+                data, shape, format, out=self.__last_frame
+            )
+        else:
+            self.__last_frame = buffer_to_frame(
+                data,
+                shape,
+                format,
+                numpy=self.numpy,
+                out=self.__last_frame,
+                layout=self.frame_layout,
+                bottom_up=self.frame_bottom_up,
+            )
+
     # endregion
 
     # region Functions
 
-    # region Not implement. Most likely useless
+    def set_controller(
+        self, port: int, device: int = Device.JOYPAD, controller: InputDevice = None
+    ) -> InputDevice:
+        """Set the input device of a port. All ports default to `Device.JOYPAD`.
+
+        Args:
+            port (int): player id
+            device (int, optional): libretro device type, may be a subclass from `controller_info`. Defaults to Device.JOYPAD.
+            controller (InputDevice, optional): Device to read input from. Defaults to a new one of `device_types`.
+
+        Returns:
+            InputDevice: Controller of port
+        """
+        self.__ensure_ports(port + 1)
 
-    # def set_player_controller(self, player: int, device: Device):
-    #     """Sets the input device of a player. All player devices default to Device.JOYPAD.
+        if controller is None:
+            controller = self.device_types.get(device & 0xFF, InputDevice)()
 
-    #     Args:
-    #         player (int): player id
-    #         device (Device): set as input device
-    #     """
-    #     self.core.retro_set_controller_port_device(player, device)
-    #     logging.debug("Set player controller type")
+        self.controllers[port] = controller
+        self.core.retro_set_controller_port_device(port, device)
 
-    # endregion
+        logging.debug(f"Set controller of port {port}: {device}")
+        return controller
+
+    def set_inputs(self, actions: Sequence[Sequence[int | float]]):
+        """Set the inputs of several ports at once (see `InputDevice.set_inputs`).
+
+        Args:
+            actions (Sequence[Sequence[int | float]]): One row of input values per port, starting at port 0
+        """
+        for controller, values in zip(self.controllers, actions):
+            controller.set_inputs(values)
+
+    def __ensure_ports(self, ports: int):
+        """Create a gamepad for every missing port."""
+        while len(self.controllers) < ports:
+            self.controllers.append(GamePad())
 
     def load(self, path: str):
         """Load a game from ROM
@@ -349,6 +504,8 @@ class RetroPy:
         set_ptr(MemoryRegion.SYSTEM_RAM, "system")
         set_ptr(MemoryRegion.VIDEO_RAM, "video")
 
+        self.__serialize_size = None
+
         logging.info("Game loaded")
 
     def unload(self):
@@ -358,19 +515,141 @@ class RetroPy:
         """
         self.core.retro_unload_game()
         self.loaded = False
+        self.__serialize_size = None
 
         self.memory._clear()
         self.cheats._clear()
 
         logging.info("Game unloaded")
 
-    def frame_advance(self):
-        """
-        Run core for a single video frame
+    def frame_advance(
+        self, copy: bool = False, render: bool = True, audio: bool = True
+    ) -> Frame | None:
+        """Run core for a single video frame
+
+        Cores supporting `GET_AUDIO_VIDEO_ENABLE` skip rendering / audio synthesis if disabled.
+        Frames are never converted without `render`, even if the core still emits them.
+
+        Args:
+            copy (bool, optional): Return a copy instead of the reused frame buffer. Needed if the frame is kept beyond the next call. Defaults to False.
+            render (bool, optional): Whether video is needed for this frame. Defaults to True.
+            audio (bool, optional): Whether audio is needed for this frame. Defaults to True.
+
+        Returns:
+            Frame | None: Last video frame. None without `render` or in `lazy` mode, read `last_frame` instead.
         """
+        av_enable = AvEnable(0)
+        if render:
+            av_enable |= AvEnable.VIDEO
+        if audio:
+            av_enable |= AvEnable.AUDIO
+        self.av_enable = av_enable
+
+        # Single samples are only worth a python call if they are kept
+        capture = self.capture_audio and audio
+        if capture != self.__audio_sample_installed:
+            self.__install_audio_sample(capture)
+
+        # A pending lazy frame must not change if the core draws into the software framebuffer again
+        if self.__frame_pending and self.__raw_data is self.software_framebuffer:
+            self.__raw_data = self.__copy_raw_frame(
+                self.software_framebuffer.ctypes.data,
+                self.__raw_shape[0] * self.__raw_shape[2],
+            )
+
+        self.audio.begin_frame()
         self.core.retro_run()
+        self.audio.flush()
+
+        if self.lazy or not render:
+            return None
+
+        if copy and self.last_frame is not None:
+            return self.last_frame.copy()
+
         return self.last_frame
 
+    def record_movie(self, path: str, savestate: bool = True) -> MovieRecorder:
+        """Start recording the controller state of every following input poll (usually once per frame).
+
+        Args:
+            path (str): Movie file
+            savestate (bool, optional): Start from the current state (embedded savestate). Otherwise the game is reset (power-on). Defaults to True.
+
+        Returns:
+            MovieRecorder: Active recorder (also `movie`), close it or call `stop_movie` to finish the file
+
+        Raises:
+            ValueError: A controller cannot be recorded (see `movie.recorded_device`)
+        """
+        # Unsupported controllers fail before the game is reset
+        for controller in self.controllers:
+            recorded_device(controller)
+
+        if savestate:
+            state = self.save_state()
+        else:
+            state = None
+            self.reset()
+
+        self.movie = MovieRecorder(path, self.controllers, state)
+        return self.movie
+
+    def replay_movie(
+        self, path: str, render: bool = True, audio: bool = False
+    ) -> Iterator[Frame | None]:
+        """Replay a movie frame by frame.
+
+        Runs as fast as it is iterated; without `render` and `audio` nothing is converted (headless).
+        Ports are set to the recorded devices first. Afterwards controllers and keyboard return to their state before the replay.
+
+        Args:
+            path (str): Movie file
+            render (bool, optional): Whether frames are needed. Defaults to True.
+            audio (bool, optional): Whether audio is needed. Defaults to False.
+
+        Yields:
+            Frame | None: Frame after every movie frame (see `frame_advance`)
+        """
+        with MoviePlayer(path) as movie:
+            for port, device in enumerate(movie.devices):
+                if (
+                    port >= len(self.controllers)
+                    or recorded_device(self.controllers[port]) != device
+                ):
+                    self.set_controller(port, device)
+
+            if movie.savestate is not None:
+                self.load_state(movie.savestate)
+            else:
+                self.reset()
+
+            # Replays overwrite the input state, the core must not keep seeing the last movie frame
+            live = [
+                (controller.values[:], controller.raw[:], controller.joypad_mask)
+                for controller in self.controllers
+            ]
+            keys = bytes(self.keyboard.keys)
+
+            self.movie = movie
+            try:
+                while not movie.finished:
+                    yield self.frame_advance(render=render, audio=audio)
+            finally:
+                self.movie = None
+
+                for controller, (values, raw, mask) in zip(self.controllers, live):
+                    controller.values[:] = values
+                    controller.raw[:] = raw
+                    controller.joypad_mask = mask
+                self.keyboard.restore(keys)
+
+    def stop_movie(self):
+        """Finish recording / replaying and detach the movie."""
+        if self.movie is not None:
+            self.movie.close()
+            self.movie = None
+
     def reset(self):
         """
         Reset current game to intial state
@@ -378,23 +657,55 @@ class RetroPy:
         self.core.retro_reset()
         logging.info("Game reset")
 
-    def save_state(self) -> Savestate:
+    @property
+    def serialize_size(self) -> int:
+        """Bytes needed by a savestate.
+
+        Queried once per loaded game, or on every access if the core declared `SerializationQuirks.CORE_VARIABLE_SIZE`.
+        """
+        if (
+            self.__serialize_size is None
+            or self.serialization_quirks & SerializationQuirks.CORE_VARIABLE_SIZE
+        ):
+            self.__serialize_size = self.core.retro_serialize_size()
+
+        return self.__serialize_size
+
+    def savestate_pool(self, count: int = 0) -> SavestatePool:
+        """Create a pool of reusable savestate buffers sized for the loaded game.
+
+        Args:
+            count (int, optional): Number of buffers allocated up front. Defaults to 0.
+
+        Returns:
+            SavestatePool: Pool to be used with `save_state(into=pool.acquire())`
+        """
+        return SavestatePool(self.serialize_size, count)
+
+    def save_state(self, into: Savestate = None) -> Savestate:
         """Save current core state
 
+        Args:
+            into (Savestate, optional): Existing savestate to overwrite. Its buffer is only reallocated if the state grew. Defaults to a new savestate.
+
         Raises:
             SavestateError: Creating savestate failed
 
         Returns:
-            Savestate: Savestate data
+            Savestate: Savestate data (`into` if given)
         """
+        size = self.serialize_size
 
-        size = self.core.retro_serialize_size()
-        save = Savestate(size)
+        if into is None:
+            save = Savestate(size)
+        else:
+            save = into
+            save.reserve(size)
 
-        if not bool(self.core.retro_serialize(save.data, save.size)):
+        if not self.core.retro_serialize(save.data, size):
             raise SavestateError("Creating savestate failed")
 
-        logging.info(f"State saved")
+        logging.debug("State saved")
 
         return save
 
@@ -411,7 +722,7 @@ class RetroPy:
         if not bool(self.core.retro_unserialize(savestate.data, savestate.size)):
             raise SavestateError("Loading savestate failed")
 
-        logging.info(f"State loaded")
+        logging.debug("State loaded")
 
     # Cheats - index: identifier, enabled: toggle, code: cheat code
     # https://github.com/libretro/RetroArch/blob/master/cheat_manager.c#L78
@@ -456,12 +767,40 @@ class RetroPy:
         logging.debug("Callback: video_refresh")
 
         # Data may be NULL if GET_CAN_DUPE returns true (libretro.h: 4381)
-        if not data:
+        # The previous frame is still valid and does not need to be touched
+        self.frame_is_dupe = not data
+
+        if self.recorder is not None and self.av_enable & AvEnable.VIDEO:
+            self.recorder.push(data, (height, width, pitch), self.pixel_format)
+
+        if self.frame_is_dupe or not self.av_enable & AvEnable.VIDEO:
             return
 
-        self.last_frame = buffer_to_frame(
-            data, (height, width, pitch), self.pixel_format, numpy=self.numpy
-        )
+        # Core rendered into our own memory, no pointer handling needed
+        if data == self.__software_framebuffer_address:
+            data = self.software_framebuffer
+
+        if self.lazy:
+            # Keep a raw copy, conversion is done when `last_frame` is read
+            # The software framebuffer is only copied if it is still pending at the next `retro_run`
+            if data is not self.software_framebuffer:
+                data = self.__copy_raw_frame(data, height * pitch)
+
+            self.__raw_data = data
+            self.__raw_shape = (height, width, pitch)
+            self.__raw_format = self.pixel_format
+            self.__frame_pending = True
+            return
+
+        self.__convert_frame(data, (height, width, pitch), self.pixel_format)
+
+    def __copy_raw_frame(self, data, size: int) -> Array[c_ubyte]:
+        """Copy a raw frame into the reused buffer of `lazy` mode."""
+        if self.__raw_frame is None or len(self.__raw_frame) < size:
+            self.__raw_frame = (c_ubyte * size)()
+
+        memmove(self.__raw_frame, data, size)
+        return self.__raw_frame
 
     def audio_sample(self, left: int, right: int) -> None:
         """New audio frame is available
@@ -472,6 +811,26 @@ class RetroPy:
         """
         logging.debug("Callback: audio_sample")
 
+        self.audio.write_sample(left, right)
+
+    def __audio_sample_callback(self) -> Callable[[int, int], None]:
+        """Function registered as `retro_audio_sample`.
+
+        Unless `audio_sample` is overridden, samples go straight into the staging array of `audio`,
+        skipping method dispatch and logging for each of the ~800 calls per frame.
+        """
+        if type(self).audio_sample is RetroPy.audio_sample:
+            return self.audio.sample_writer()
+
+        return self.audio_sample
+
+    def __install_audio_sample(self, capture: bool):
+        """Register python callback or native no-op as `retro_audio_sample`."""
+        self.core.retro_set_audio_sample(
+            self.__cb_audio if capture else cb.audio_sample_noop
+        )
+        self.__audio_sample_installed = capture
+
     def audio_sample_batch(self, data: POINTER(c_int16), frames: int) -> int:
         """New audio frames are available
 
@@ -480,16 +839,33 @@ class RetroPy:
             frames (int): number of audio frames
 
         Returns:
-            int: ?
+            int: number of consumed audio frames
         """
         logging.debug("Callback: audio_sample_batch")
 
-        return 0
+        # Same condition as for single samples (see `frame_advance`)
+        if not self.__audio_sample_installed:
+            return frames
+
+        return self.audio.write(data, frames)
 
     def input_poll(self) -> None:
         """Read frontend input"""
         logging.debug("Callback: input_poll")
 
+        # Queued keyboard events reach the core in one batch per frame, replays supply their own
+        if not isinstance(self.movie, MoviePlayer):
+            self.keyboard.poll()
+        for controller in self.controllers:
+            controller.poll()
+
+        # Movies see exactly the state returned by the following `input_state` calls
+        if self.movie is not None:
+            if self.movie.closed:
+                self.movie = None
+            else:
+                self.movie.on_frame(self.controllers, self.keyboard)
+
     def input_state(self, port: int, device: int, index: int, id: int) -> int:
         """Pass values of `input_poll` to core
 
@@ -502,11 +878,14 @@ class RetroPy:
         Returns:
             int: Value of input action
         """
+        # Called many times per frame, kept free of logging
+        if device == Device.KEYBOARD:
+            return self.keyboard.get_state(device, index, id)
 
-        value = self.controllers[port].get_state(device, index, id)
+        if port < len(self.controllers):
+            return self.controllers[port].get_state(device, index, id)
 
-        logging.debug("Callback: input_state")
-        return value
+        return 0
 
     # endregion
 
@@ -521,8 +900,12 @@ class RetroPy:
         return False
 
     def env_GET_CAN_DUPE(self, data) -> bool:
-        logging.debug("SET_MESSAGE (not implemented)")
-        return False
+        # Duplicated frames are passed as NULL and `last_frame` is reused
+        if data:
+            cast(data, POINTER(c_bool)).contents.value = True
+
+        logging.debug("GET_CAN_DUPE")
+        return True
 
     def env_SET_MESSAGE(self, data) -> bool:
         logging.debug("SHUTDOWN (not implemented)")
@@ -563,23 +946,24 @@ class RetroPy:
         # Add a controller for each player
 
         # input: InputDescriptor
-        for input in foreach(data, lambda v: v.description):
-            # print(
-            #     input.port,
-            #     Device(input.device),
-            #     input.index,
-            #     input.id,
-            #     input.description,
-            # )
-            if input.port >= len(self.controllers):
-                self.controllers.append(GamePad())
+        ports = max(
+            (input.port + 1 for input in foreach(data, lambda v: v.description)),
+            default=0,
+        )
+        self.__ensure_ports(ports)
 
         logging.debug("SET_INPUT_DESCRIPTORS")
         return False
 
     def env_SET_KEYBOARD_CALLBACK(self, data) -> bool:
-        logging.debug("SET_KEYBOARD_CALLBACK (not implemented)")
-        return False
+        # The struct may live on the stack of the core, keep a copy
+        callback = KeyboardCallback.from_buffer_copy(
+            string_at(data, sizeof(KeyboardCallback))
+        ).callback
+        self.keyboard.callback = callback if callback else None
+
+        logging.debug("SET_KEYBOARD_CALLBACK")
+        return True
 
     def env_SET_DISK_CONTROL_INTERFACE(self, data) -> bool:
         logging.debug("SET_DISK_CONTROL_INTERFACE (not implemented)")
@@ -759,17 +1143,16 @@ class RetroPy:
         return False
 
     def env_SET_CONTROLLER_INFO(self, data) -> bool:
-        data = cast(data, POINTER(ControllerInfo)).contents
-
-        accepted_controller = []
+        data = cast(data, POINTER(ControllerInfo))
 
-        for i in range(data.num_types):
-            info = data.types[i]
-            accepted_controller.append((info.id, info.desc))
+        # One entry per port, terminated by an empty entry
+        self.controller_info = [
+            [(port.types[i].id, port.types[i].desc) for i in range(port.num_types)]
+            for port in foreach(data, lambda v: v.types)
+        ]
+        self.__ensure_ports(len(self.controller_info))
 
-        # print(accepted_controller)
-
-        logging.debug("SET_CONTROLLER_INFO")
+        logging.debug(f"SET_CONTROLLER_INFO: {len(self.controller_info)} ports")
 
         return True
 
@@ -798,8 +1181,35 @@ class RetroPy:
         return False
 
     def env_GET_CURRENT_SOFTWARE_FRAMEBUFFER(self, data) -> bool:
-        logging.debug("GET_CURRENT_SOFTWARE_FRAMEBUFFER (not implemented)")
-        return False
+        # Frames are read as numpy arrays directly from memory owned by the frontend
+        if not data or not self.numpy:
+            return False
+
+        data = cast(data, POINTER(Framebuffer)).contents
+
+        # `access_flags` is requested by the core, the buffer can be read and written
+        supported = MEMORY_ACCESS.READ | MEMORY_ACCESS.WRITE
+        if data.access_flags & ~supported.value:
+            return False
+
+        format = self.pixel_format
+        dtype = np.uint32 if format == PixelFormat.XRGB8888 else np.uint16
+        shape = (data.height, data.width)
+
+        # Reallocate only if geometry or pixel format change
+        fb = self.software_framebuffer
+        if fb is None or fb.shape != shape or fb.dtype != dtype:
+            fb = np.zeros(shape, dtype=dtype)
+            self.software_framebuffer = fb
+            self.__software_framebuffer_address = fb.ctypes.data
+
+        data.data = self.__software_framebuffer_address
+        data.pitch = fb.strides[0]
+        data.format = format.value
+        data.memory_flags = MEMORY_TYPE.CACHED
+
+        logging.debug("GET_CURRENT_SOFTWARE_FRAMEBUFFER")
+        return True
 
     def env_GET_HW_RENDER_INTERFACE(self, data) -> bool:
         logging.debug("GET_HW_RENDER_INTERFACE (not implemented)")
@@ -815,8 +1225,15 @@ class RetroPy:
         return False
 
     def env_SET_SERIALIZATION_QUIRKS(self, data) -> bool:
-        logging.debug("SET_SERIALIZATION_QUIRKS (not implemented)")
-        return False
+        quirks = cast(data, POINTER(c_uint64)).contents
+
+        # Unknown flags are cleared to report them as unsupported
+        quirks.value &= sum(SerializationQuirks)
+        self.serialization_quirks = SerializationQuirks(quirks.value)
+        self.__serialize_size = None
+
+        logging.debug(f"SET_SERIALIZATION_QUIRKS: {self.serialization_quirks!r}")
+        return True
 
     def env_SET_HW_SHARED_CONTEXT(self, data) -> bool:
         logging.debug("SET_HW_SHARED_CONTEXT (not implemented)")
@@ -831,8 +1248,11 @@ class RetroPy:
         return False
 
     def env_GET_AUDIO_VIDEO_ENABLE(self, data) -> bool:
-        logging.debug("GET_AUDIO_VIDEO_ENABLE (not implemented)")
-        return False
+        if data:
+            cast(data, POINTER(c_int)).contents.value = self.av_enable
+
+        logging.debug("GET_AUDIO_VIDEO_ENABLE")
+        return True
 
     def env_GET_MIDI_INTERFACE(self, data) -> bool:
         logging.debug("GET_MIDI_INTERFACE (not implemented)")
@@ -847,13 +1267,10 @@ class RetroPy:
         return False
 
     def env_GET_INPUT_BITMASKS(self, data) -> bool:
-        if data:
-            data = cast(data, POINTER(c_bool)).contents.value
-            ...
-            # return True
-
-        logging.debug(f"GET_INPUT_BITMASKS: {data}")
-        return False
+        # All joypad buttons of a port are answered by a single `input_state` call with id MASK
+        # Bitmasks are kept up to date by the controllers (see `InputDevice.joypad_mask`)
+        logging.debug("GET_INPUT_BITMASKS")
+        return True
 
     def env_GET_CORE_OPTIONS_VERSION(self, data) -> bool:
         data = cast(data, POINTER(c_uint)).contents.value
@@ -1,8 +1,9 @@
 # Gym is made for single agents envs, therefore only one player is supported
-# MAYBE a multi agent version (likly following PettingZoo's API) will be made eventually
+# Multiple players are supported by `RetroParallelEnv` (following PettingZoo's parallel API)
 
 # from gymnasium.envs.registration import register
 
 # register(id="retropy/RetroGym-v0", entry_point="retropy.frontends.gym.gym:RetroGym")
 
 from .gym import RetroGym
+from .parallel import RetroParallelEnv
@@ -1,5 +1,6 @@
 from ...core.retro import RetroPy
 from ...utils.input import GamePadInput
+from ...utils.preprocessing import FramePreprocessing, AudioPreprocessing
 
 import gymnasium as gym
 from gymnasium import spaces
@@ -13,22 +14,59 @@ from typing import Sequence
 
 
 class RetroGym(gym.Env):
-    def __init__(self, core: str, rom: str):
-        self.core = RetroPy(core, True)
+    def __init__(
+        self,
+        core: str,
+        rom: str,
+        preprocessing: FramePreprocessing = None,
+        frameskip: int = 1,
+        audio: AudioPreprocessing = None,
+    ):
+        self.core = RetroPy(core, True, capture_audio=audio is not None)
+        self.frameskip = frameskip
+        self.audio = audio
+        self.core.preprocessing = preprocessing
         self.core.load(rom)
 
-        geometry = self.core.system_av_info().geometry
+        av_info = self.core.system_av_info()
+        geometry = av_info.geometry
 
-        obs_shape = (geometry.base_height, geometry.base_width, 3)
+        if preprocessing:
+            obs_shape = preprocessing.output_shape(
+                geometry.base_height, geometry.base_width
+            )
+            dtype = preprocessing.dtype
+        else:
+            obs_shape = (geometry.base_height, geometry.base_width, 3)
+            dtype = np.dtype(np.uint8)
 
-        self.observation_space = spaces.Box(0, 255, obs_shape, dtype=np.uint8)
+        high = 1.0 if dtype.kind == "f" else 255
+        self.observation_space = spaces.Box(0, high, obs_shape, dtype=dtype)
         self.action_space = spaces.Box(0, 1, (len(GamePadInput),))
 
+        # Audio features are added next to the frame, always covering a fixed number of samples
+        if audio:
+            self.sample_rate = av_info.timing.sample_rate
+            self.audio_window = audio.window or round(
+                self.sample_rate / av_info.timing.fps * frameskip
+            )
+
+            low, high = audio.bounds()
+            self.observation_space = spaces.Dict(
+                {
+                    "video": self.observation_space,
+                    "audio": spaces.Box(
+                        low, high, audio.output_shape(self.audio_window), np.float32
+                    ),
+                }
+            )
+
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
         self.core.reset()
+        self.core.audio.clear()
 
-        observation = self.core.frame_advance()
+        observation = self.__observation(self.core.frame_advance(copy=True))
         info = {}
 
         return observation, info
@@ -38,7 +76,7 @@ class RetroGym(gym.Env):
     ) -> tuple[np.ndarray, float, bool, bool, dict]:
         self.__set_controller_input(action)
 
-        observation = self.core.frame_advance()
+        observation = self._advance()
         reward = self._reward_function(observation)
         terminated, truncated = self._stopping_criterion()
         info = {}
@@ -47,9 +85,25 @@ class RetroGym(gym.Env):
 
     # Helper function
 
+    def _advance(self) -> np.ndarray | dict[str, np.ndarray]:
+        """Run one step (`frameskip` frames) with the current inputs and return the observation."""
+        # Action is repeated; only the last frame of the window is rendered
+        for _ in range(self.frameskip - 1):
+            self.core.frame_advance(render=False, audio=self.audio is not None)
+
+        return self.__observation(self.core.frame_advance(copy=True))
+
+    def __observation(self, frame: np.ndarray) -> np.ndarray | dict[str, np.ndarray]:
+        if self.audio is None:
+            return frame
+
+        features = self.audio.apply(
+            self.core.drain_audio(), self.audio_window, self.sample_rate
+        )
+        return {"video": frame, "audio": features}
+
     def __set_controller_input(self, action):
-        for input, value in zip(GamePadInput, action):
-            self.core.controllers[0][input] = value
+        self.core.controllers[0].set_inputs(action)
 
     # RL functions
 
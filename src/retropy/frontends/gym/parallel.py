@@ -0,0 +1,120 @@
+# multi agent environment following PettingZoo's parallel API (without depending on it)
+
+from .gym import RetroGym
+from ...core.device import Device
+from ...utils.input import GamePadInput
+from ...utils.preprocessing import FramePreprocessing, AudioPreprocessing
+
+from gymnasium import spaces
+
+import numpy as np
+from typing import Sequence
+
+# https://pettingzoo.farama.org/api/parallel/
+
+
+class RetroParallelEnv:
+    """
+    Multi agent environment, one agent per controller port.
+
+    All agents observe the same screen and act simultaneously.
+    Actions of all players are collected into one matrix and applied with a single `RetroPy.set_inputs` call per step.
+
+    Example:
+        >>> env = MyParallelEnv(core, rom, players=2)
+        >>> observations, infos = env.reset()
+        >>> actions = {agent: env.action_space(agent).sample() for agent in env.agents}
+        >>> observations, rewards, terminations, truncations, infos = env.step(actions)
+    """
+
+    metadata = {"name": "retropy_parallel_v0"}
+
+    def __init__(
+        self,
+        core: str,
+        rom: str,
+        players: int = 2,
+        preprocessing: FramePreprocessing = None,
+        frameskip: int = 1,
+        audio: AudioPreprocessing = None,
+    ):
+        self.env = RetroGym(core, rom, preprocessing, frameskip, audio)
+        self.core = self.env.core
+
+        # Every agent needs its own port, even if the core declares less
+        for port in range(len(self.core.controllers), players):
+            self.core.set_controller(port, Device.JOYPAD)
+
+        self.possible_agents = [f"player_{i}" for i in range(players)]
+        self.agents = list(self.possible_agents)
+
+        self.observation_spaces = {
+            agent: self.env.observation_space for agent in self.possible_agents
+        }
+        self.action_spaces = {
+            agent: spaces.Box(0, 1, (len(GamePadInput),))
+            for agent in self.possible_agents
+        }
+
+        # Reused every step; agents without action are idle
+        self.__actions = np.zeros((players, len(GamePadInput)), dtype=np.float64)
+
+    def observation_space(self, agent: str) -> spaces.Space:
+        return self.observation_spaces[agent]
+
+    def action_space(self, agent: str) -> spaces.Space:
+        return self.action_spaces[agent]
+
+    @property
+    def num_agents(self) -> int:
+        return len(self.agents)
+
+    @property
+    def max_num_agents(self) -> int:
+        return len(self.possible_agents)
+
+    def reset(self, seed=None, options=None):
+        observation, _ = self.env.reset(seed=seed, options=options)
+        self.agents = list(self.possible_agents)
+
+        observations = {agent: observation for agent in self.agents}
+        infos = {agent: {} for agent in self.agents}
+
+        return observations, infos
+
+    def step(self, actions: dict[str, Sequence[float]]):
+        self.__actions[:] = 0
+        for i, agent in enumerate(self.possible_agents):
+            if agent in actions:
+                self.__actions[i] = actions[agent]
+
+        self.core.set_inputs(self.__actions)
+
+        observation = self.env._advance()
+        rewards = self._reward_function(observation)
+        terminated, truncated = self._stopping_criterion()
+
+        agents = self.agents
+        observations = {agent: observation for agent in agents}
+        terminations = {agent: terminated for agent in agents}
+        truncations = {agent: truncated for agent in agents}
+        infos = {agent: {} for agent in agents}
+
+        if terminated or truncated:
+            self.agents = []
+
+        return observations, rewards, terminations, truncations, infos
+
+    def render(self):
+        return self.core.last_frame
+
+    def close(self):
+        pass
+
+    # RL functions
+
+    def _reward_function(self, observation: np.ndarray) -> dict[str, float]:
+        raise NotImplementedError()
+
+    def _stopping_criterion(self) -> tuple[bool, bool]:
+        raise NotImplementedError()
@@ -7,6 +7,8 @@ from ...utils.input import GamePadInput
 import gymnasium as gym
 from gymnasium import spaces, ActionWrapper
 
+import numpy as np
+
 # https://gymnasium.farama.org/tutorials/gymnasium_basics/implementing_custom_wrappers/
 
 
@@ -26,14 +28,12 @@ class DiscreteInputs(ActionWrapper):
         self.map = map
         self.action_space = spaces.Discrete(len(self.map))
 
-    def action(self, action: int):
-        inputs = self.map[action]
-
-        action = [0] * len(GamePadInput)
-        for i, input in enumerate(GamePadInput):
-            if input in inputs:
-                action[i] = 1
-
-        print(action)
+        # Controller input of every discrete action, rows in order of `GamePadInput`
+        self.table = np.zeros((len(self.map), len(GamePadInput)), dtype=np.float64)
+        for action, inputs in enumerate(self.map):
+            for i, input in enumerate(GamePadInput):
+                if input in inputs:
+                    self.table[action, i] = 1
 
-        return action
+    def action(self, action: int) -> np.ndarray:
+        return self.table[action]
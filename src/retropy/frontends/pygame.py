@@ -1,5 +1,6 @@
 from ..core.retro import RetroPy
 from ..utils.input import GamePadInput
+from ..utils.video import FrameLayout
 import pygame
 
 
@@ -28,6 +29,9 @@ class RetroPyGame(RetroPy):
 
         self.scaling = scaling
 
+        # Frames match pygame's surfarray order and can be blitted as is
+        self.frame_layout = FrameLayout.WHC
+
     def run(self):
         av_info = self.system_av_info()
 
@@ -45,15 +49,21 @@ class RetroPyGame(RetroPy):
         self.sound = None
         self.pos = 0
 
+        surf = None
+
         while self.running:
             frame = self.frame_advance()
 
-            surf = pygame.surfarray.make_surface(frame)
-            surf = pygame.transform.rotate(surf, -90)
-            surf = pygame.transform.flip(surf, True, False)
+            # Surface is only recreated if the geometry changes
+            if surf is None or surf.get_size() != frame.shape[:2]:
+                surf = pygame.Surface(frame.shape[:2], depth=24)
+
+            pygame.surfarray.blit_array(surf, frame)
+
             if self.scaling != 1.0:
-                surf = pygame.transform.scale_by(surf, self.scaling)
-            self.display.blit(surf, (0, 0))
+                pygame.transform.scale(surf, self.display.get_size(), self.display)
+            else:
+                self.display.blit(surf, (0, 0))
             pygame.display.flip()
 
             self.clock.tick(self.FPS)
@@ -76,3 +86,5 @@ class RetroPyGame(RetroPy):
             elif event.type == pygame.KEYUP and event.key in self.keybindings:
                 # device, index, button = self.keybindings[event.key]
                 self.controllers[port][self.keybindings[event.key]] = 0
+
+        super().input_poll()
@@ -1,6 +1,8 @@
-from ctypes import POINTER, c_int16
+from ctypes import POINTER, c_ubyte
 from ..core.retro import RetroPy
+from ..utils.audio import Resampler
 from ..utils.input import GamePadInput
+from ..utils.video import FrameLayout
 
 import pyglet
 import pyglet.window.key as key
@@ -23,11 +25,18 @@ class RetroPyGlet(RetroPy):
         key.B: GamePadInput.START,
     }
 
-    def __init__(self, path: str, scaling: float = 1.0) -> None:
+    def __init__(
+        self, path: str, scaling: float = 1.0, sample_rate: int = 48000
+    ) -> None:
         super().__init__(path, True)
         self.scaling = scaling
+        self.sample_rate = sample_rate
         self.running = False
 
+        # OpenGL consumes BGRA rows bottom to top without any conversion
+        self.frame_layout = FrameLayout.BGRA
+        self.frame_bottom_up = True
+
         # Nearest scaling
         pyglet.image.Texture.default_min_filter = pyglet.gl.GL_NEAREST
         pyglet.image.Texture.default_mag_filter = pyglet.gl.GL_NEAREST
@@ -38,7 +47,6 @@ class RetroPyGlet(RetroPy):
         HEIGHT = av_info.geometry.base_height
         WIDTH = av_info.geometry.base_width
         FPS = int(av_info.timing.fps)
-        SAMPLE_RATE = int(av_info.timing.sample_rate)
 
         window = pyglet.window.Window(
             height=HEIGHT * self.scaling,
@@ -46,15 +54,16 @@ class RetroPyGlet(RetroPy):
             caption="Pyglet: Libretro",
         )
 
-        self.audio = BufferSource(sample_rate=512 * FPS)
-        self.audio.play()
+        # Core audio is resampled to the playback rate, drift is corrected by the fill level
+        self.audio_source = BufferSource(sample_rate=self.sample_rate)
+        self.audio_source.play()
 
-        self.last_audio_frame = np.zeros((512, 2), dtype=np.int16)
+        self.resampler = Resampler(av_info.timing.sample_rate, self.sample_rate)
 
-        frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        frame = np.zeros((HEIGHT, WIDTH), dtype=np.uint32)
 
         image = pyglet.image.ImageData(
-            width=WIDTH, height=HEIGHT, fmt="RGB", data=frame.tobytes()
+            width=WIDTH, height=HEIGHT, fmt="BGRA", data=frame.tobytes()
         )
 
         @window.event
@@ -73,38 +82,88 @@ class RetroPyGlet(RetroPy):
         def on_draw():
             frame = self.frame_advance()
 
-            image.set_data("RGB", -WIDTH * 3, frame.tobytes())
+            # Frame buffer is reused and outlives the upload, so it can be passed without copy
+            image.set_data("BGRA", WIDTH * 4, frame.ctypes.data_as(POINTER(c_ubyte)))
 
             window.clear()
             image.blit(0, 0, width=window.width, height=window.height)
 
-            self.audio.set_audio_data(self.last_audio_frame)
+            audio = self.resampler.process(
+                self.drain_audio(), fill=self.audio_source.fill
+            )
+            self.audio_source.set_audio_data(audio)
 
         pyglet.app.run(1 / FPS)
 
-    def audio_sample_batch(self, data: POINTER(c_int16), frames: int) -> int:
-        data = np.ctypeslib.as_array(data, (frames * 2,)).reshape((frames, 2))
-        self.last_audio_frame = data
-        return 0
-
 
 class BufferSource(pyglet.media.Source):
-    def __init__(self, sample_rate: int) -> None:
+    """
+    Streaming source backed by a fixed byte ring.
+
+    The emulation thread only advances `write_pos`, pyglet's audio thread only advances `read_pos`.
+    Data is copied before its cursor is published, so both sides work without a lock.
+    """
+
+    def __init__(self, sample_rate: int, latency: float = 0.1) -> None:
         CHANNELS = 2
         BIT_SIZE = 16
 
         self.audio_format = AudioFormat(CHANNELS, BIT_SIZE, sample_rate)
 
-        self._data = np.zeros((sample_rate, CHANNELS), dtype=np.int16)
+        # Twice the target latency, the resampler keeps it half full
+        self.capacity = self.audio_format.align(
+            int(2 * latency * self.audio_format.bytes_per_second)
+        )
+
+        self._ring = bytearray(self.capacity)
+        self._view = memoryview(self._ring)
+
+        # Total bytes written / read, position in ring is `pos % capacity`
+        self.write_pos = 0
+        self.read_pos = 0
+
+        self.underruns = 0
+        """Number of requests which were (partially) filled with silence"""
+        self.overruns = 0
+        """Number of bytes dropped because the ring was full"""
+
+    @property
+    def fill(self) -> float:
+        """Fill level in [0, 1]"""
+        return (self.write_pos - self.read_pos) / self.capacity
 
     def set_audio_data(self, data: np.ndarray):
-        size = len(data)
+        """Append audio (emulation thread). Audio not fitting into the ring is dropped."""
+        data = memoryview(data).cast("B")
+
+        free = self.capacity - (self.write_pos - self.read_pos)
+        size = min(len(data), free)
+        self.overruns += len(data) - size
 
-        buffer = np.roll(self._data, -size, axis=0)
-        buffer[-size:] = data
-        self._data = buffer
+        self._copy_in(self.write_pos % self.capacity, data[:size])
+        self.write_pos += size
 
     def get_audio_data(self, num_bytes, compensation_time=0):
-        data = self._data.tobytes()
-        duration = float(len(data)) / self.audio_format.bytes_per_second
-        return AudioData(data, len(data), 0, duration, [])
+        """Serve exactly `num_bytes` (audio thread), padded with silence on underrun."""
+        num_bytes = self.audio_format.align(num_bytes)
+
+        size = self.audio_format.align(min(num_bytes, self.write_pos - self.read_pos))
+        if size < num_bytes:
+            self.underruns += 1
+
+        data = (c_ubyte * num_bytes)()
+        self._copy_out(self.read_pos % self.capacity, memoryview(data).cast("B")[:size])
+        self.read_pos += size
+
+        duration = float(num_bytes) / self.audio_format.bytes_per_second
+        return AudioData(data, num_bytes, 0, duration, [])
+
+    def _copy_in(self, start: int, data: memoryview):
+        first = min(len(data), self.capacity - start)
+        self._view[start : start + first] = data[:first]
+        self._view[: len(data) - first] = data[first:]
+
+    def _copy_out(self, start: int, out: memoryview):
+        first = min(len(out), self.capacity - start)
+        out[:first] = self._view[start : start + first]
+        out[first:] = self._view[: len(out) - first]
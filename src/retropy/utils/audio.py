@@ -0,0 +1,315 @@
+# audio utilities
+
+from __future__ import annotations
+
+from array import array
+from ctypes import Array, POINTER, addressof, c_int16, c_void_p, cast, memmove
+from typing import Callable, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Audio = Union["np.ndarray", memoryview]
+"""Type alias for audio frames. `N x 2` int16 array, without numpy a flat memoryview of interleaved left-right samples."""
+
+CHANNELS = 2
+"""libretro audio is always stereo"""
+
+_FRAME_SIZE = CHANNELS * 2  # bytes per stereo int16 frame
+
+
+class AudioBuffer:
+    """
+    Preallocated stereo int16 ring buffer filled by the audio callbacks.
+
+    Every batch is stored with a single `memmove` (two if it wraps around).
+    Positions are counted in frames and only ever increase, the ring index is `position % capacity`.
+    If more than `capacity` frames are not drained, the oldest frames are overwritten and counted in `overruns`.
+
+    Returned views point into internal memory and are only valid until the next write.
+
+    Single samples (`retro_audio_sample`) arrive about 800 times per frame.
+    The function returned by `sample_writer` only appends them to a staging array, which is moved into the ring by `flush`.
+    """
+
+    capacity: int
+    """Number of stereo frames which can be held"""
+    write_pos: int
+    """Total number of frames written"""
+    read_pos: int
+    """Total number of frames drained (or overwritten before being drained)"""
+    frame_pos: int
+    """`write_pos` at the start of the current video frame"""
+    overruns: int
+    """Number of frames overwritten before they were drained"""
+
+    def __init__(self, capacity: int = 1 << 16):
+        """Allocate ring buffer.
+
+        Args:
+            capacity (int, optional): Number of stereo frames. Defaults to 65536 (~1.4s at 48kHz).
+        """
+        self.capacity = capacity
+
+        self.write_pos = 0
+        self.read_pos = 0
+        self.frame_pos = 0
+        self.overruns = 0
+
+        # Ring and scratch areas to return wrapped ranges contiguously
+        self.__ring: Array[c_int16] = (c_int16 * (capacity * CHANNELS))()
+        self.__last_scratch: Array[c_int16] = (c_int16 * (capacity * CHANNELS))()
+        self.__drain_scratch: Array[c_int16] = (c_int16 * (capacity * CHANNELS))()
+        self.__address = addressof(self.__ring)
+
+        # Staging area of `sample_writer`
+        self.__samples = array("h")
+
+        if np is not None:
+            self.__ring_view = np.ctypeslib.as_array(self.__ring).reshape(
+                (-1, CHANNELS)
+            )
+            self.__last_view = np.ctypeslib.as_array(self.__last_scratch).reshape(
+                (-1, CHANNELS)
+            )
+            self.__drain_view = np.ctypeslib.as_array(self.__drain_scratch).reshape(
+                (-1, CHANNELS)
+            )
+        else:
+            self.__ring_view = memoryview(self.__ring).cast("B").cast("h")
+            self.__last_view = memoryview(self.__last_scratch).cast("B").cast("h")
+            self.__drain_view = memoryview(self.__drain_scratch).cast("B").cast("h")
+
+    def __len__(self) -> int:
+        """Number of frames which can be drained."""
+        return self.write_pos - self.read_pos
+
+    def clear(self):
+        """Discard all frames."""
+        self.read_pos = self.frame_pos = self.write_pos
+
+    def begin_frame(self):
+        """Mark start of a new video frame (see `last`)."""
+        self.frame_pos = self.write_pos
+
+    def sample_writer(self) -> Callable[[int, int], None]:
+        """Function with minimal overhead to be used as `retro_audio_sample` callback.
+
+        Samples are staged and only become visible after `flush`.
+
+        Returns:
+            Callable[[int, int], None]: Stores left and right channel of a single frame
+        """
+        append = self.__samples.append
+
+        def write_sample(left: int, right: int):
+            append(left)
+            append(right)
+
+        return write_sample
+
+    def flush(self):
+        """Move samples staged by `sample_writer` into the ring."""
+        if self.__samples:
+            address, length = self.__samples.buffer_info()
+            self.__copy(address, length // CHANNELS)
+            del self.__samples[:]
+
+    def write(self, data: POINTER(c_int16) | int, frames: int) -> int:
+        """Copy interleaved stereo frames into the ring.
+
+        Staged single samples are flushed first, so both callbacks keep their order.
+
+        Args:
+            data (POINTER(c_int16) | int): alternating left-right audio samples (or their address)
+            frames (int): number of audio frames
+
+        Returns:
+            int: Number of frames consumed (always `frames`)
+        """
+        if frames <= 0:
+            return 0
+
+        self.flush()
+        return self.__copy(cast(data, c_void_p).value, frames)
+
+    def write_sample(self, left: int, right: int):
+        """Store a single stereo frame.
+
+        Args:
+            left (int): left audio channel
+            right (int): right audio channel
+        """
+        self.flush()
+
+        index = (self.write_pos % self.capacity) * CHANNELS
+        self.__ring[index] = left
+        self.__ring[index + 1] = right
+
+        self.__advance(1)
+
+    def __copy(self, address: int, frames: int) -> int:
+        """Copy frames from an address into the ring."""
+        consumed = frames
+        skipped = 0
+
+        # Only the newest `capacity` frames survive anyway
+        if frames > self.capacity:
+            skipped = frames - self.capacity
+            address += skipped * _FRAME_SIZE
+            frames = self.capacity
+
+        start = (self.write_pos + skipped) % self.capacity
+        first = min(frames, self.capacity - start)
+
+        memmove(self.__address + start * _FRAME_SIZE, address, first * _FRAME_SIZE)
+        if first < frames:
+            memmove(
+                self.__address,
+                address + first * _FRAME_SIZE,
+                (frames - first) * _FRAME_SIZE,
+            )
+
+        self.__advance(consumed)
+        return consumed
+
+    def last(self) -> Audio:
+        """Frames written since `begin_frame` (audio of the last video frame).
+
+        Returns:
+            Audio: View of frames, valid until the next write
+        """
+        start = max(self.frame_pos, self.write_pos - self.capacity)
+        return self.__view(start, self.write_pos, self.__last_view)
+
+    def drain(self) -> Audio:
+        """Take all frames written since the previous drain.
+
+        Returns:
+            Audio: View of frames, valid until the next write / drain
+        """
+        start, self.read_pos = self.read_pos, self.write_pos
+        return self.__view(start, self.write_pos, self.__drain_view)
+
+    def __advance(self, frames: int):
+        self.write_pos += frames
+
+        lost = self.write_pos - self.read_pos - self.capacity
+        if lost > 0:
+            self.overruns += lost
+            self.read_pos += lost
+
+    def __view(self, start: int, stop: int, scratch) -> Audio:
+        """Contiguous view of the frames [start, stop)."""
+        frames = stop - start
+        begin = start % self.capacity
+        first = min(frames, self.capacity - begin)
+
+        if np is not None:
+            if first == frames:
+                return self.__ring_view[begin : begin + frames]
+
+            scratch[:first] = self.__ring_view[begin:]
+            scratch[first:frames] = self.__ring_view[: frames - first]
+            return scratch[:frames]
+
+        # Flat memoryview, two samples per frame
+        if first == frames:
+            return self.__ring_view[begin * CHANNELS : (begin + frames) * CHANNELS]
+
+        scratch[: first * CHANNELS] = self.__ring_view[begin * CHANNELS :]
+        scratch[first * CHANNELS : frames * CHANNELS] = self.__ring_view[
+            : (frames - first) * CHANNELS
+        ]
+        return scratch[: frames * CHANNELS]
+
+
+class Resampler:
+    """
+    Linear stereo resampler with dynamic rate control (requires numpy).
+
+    Each block is interpolated in a single vectorized pass. The fractional read position
+    and the last input frame are carried over, so consecutive blocks form a continuous signal.
+
+    Dynamic rate control (Arntzen) adjusts the ratio by up to `max_deviation` according to the fill level
+    of the output buffer: more samples are produced while it runs empty, fewer while it runs full.
+    Playback stays in sync with emulation without ever blocking it.
+
+    Examples:
+        >>> resampler = Resampler(av_info.timing.sample_rate, 48000)
+        >>> block = resampler.process(core.last_audio, fill=len(buffer) / buffer.capacity)
+    """
+
+    input_rate: float
+    """Sample rate of core"""
+    output_rate: float
+    """Sample rate of playback"""
+    max_deviation: float
+    """Maximum relative adjustment of the ratio"""
+
+    def __init__(
+        self, input_rate: float, output_rate: float, max_deviation: float = 0.005
+    ):
+        """Create resampler.
+
+        Args:
+            input_rate (float): Sample rate of core (`SystemAvInfo.timing.sample_rate`)
+            output_rate (float): Sample rate of playback
+            max_deviation (float, optional): Maximum relative adjustment of the ratio. Defaults to 0.005.
+        """
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.max_deviation = max_deviation
+
+        # Read position relative to `__previous`, in input frames
+        self.__position = 0.0
+        self.__previous = np.zeros((1, CHANNELS), dtype=np.float32)
+
+    @property
+    def ratio(self) -> float:
+        """Nominal output frames per input frame"""
+        return self.output_rate / self.input_rate
+
+    def reset(self):
+        """Forget carried over state (e.g. after a pause)."""
+        self.__position = 0.0
+        self.__previous[:] = 0
+
+    def process(self, frames: np.ndarray, fill: float = 0.5) -> np.ndarray:
+        """Resample a block of stereo frames.
+
+        Args:
+            frames (np.ndarray): `N x 2` int16 input frames
+            fill (float, optional): Fill level of the output buffer in [0, 1]. 0.5 keeps the nominal ratio. Defaults to 0.5.
+
+        Returns:
+            np.ndarray: `M x 2` int16 output frames
+        """
+        count = len(frames)
+        if count == 0:
+            return np.empty((0, CHANNELS), dtype=np.int16)
+
+        fill = min(max(fill, 0.0), 1.0)
+        ratio = self.ratio * (1.0 + self.max_deviation * (1.0 - 2.0 * fill))
+        step = 1.0 / ratio
+
+        # Previous frame is index 0, interpolation needs both neighbours within [0, count]
+        source = np.concatenate((self.__previous, frames.astype(np.float32)))
+
+        outputs = int(np.ceil((count - self.__position) / step))
+        positions = self.__position + np.arange(outputs) * step
+
+        index = positions.astype(np.intp)
+        weight = (positions - index).astype(np.float32)[:, None]
+
+        result = source[index]
+        result += (source[index + 1] - result) * weight
+
+        self.__position += outputs * step - count
+        self.__previous[0] = source[-1]
+
+        np.rint(result, out=result)
+        np.clip(result, -32768, 32767, out=result)
+        return result.astype(np.int16)
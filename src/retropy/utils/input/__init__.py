@@ -1,5 +1,8 @@
-"""Module contains abstractions for input devices.
-"""
+"""Module contains abstractions for input devices."""
 
 from .base import InputDevice
 from .gamepad import GamePad, GamePadInput
+from .keyboard import Keyboard
+from .lightgun import Lightgun, LightgunInput
+from .mouse import Mouse, MouseInput
+from .pointer import Pointer, PointerInput
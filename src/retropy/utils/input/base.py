@@ -1,9 +1,46 @@
+from array import array
+from typing import Sequence
+
+from ...core.device import Device, Joypad
+
+
 class InputDevice:
-    """Base device interface from which every input device should inherit."""
+    """Base device interface from which every input device should inherit.
+
+    Values are stored twice:
+    `raw` keeps what was written per input name, `values` keeps the converted libretro state
+    in a flat int16 array indexed by (device, index, id), so `get_state` is a single indexed read.
+    Conversion (e.g. button thresholds) is applied when a value is written.
+
+    Joypad buttons are additionally packed into `joypad_mask` for `RETRO_DEVICE_ID_JOYPAD_MASK`.
+    """
 
-    state: dict[str, int | float]
+    DEVICES: int = 8
+    """Number of libretro device types (`RETRO_DEVICE_*` without subclass)"""
+    INDICES: int = 3
+    """Number of indices per device (`RETRO_DEVICE_INDEX_*`)"""
+    IDS: int = 16
+    """Number of ids per device and index (`RETRO_DEVICE_ID_*`)"""
+
+    inputs: dict[str, tuple[tuple[int, int, int], ...]] = {}
+    """Input name -> libretro (device, index, id) slots written by it"""
+
+    values: array
+    """Converted libretro state, see `slot`"""
+    raw: array
+    """Written values in order of `inputs`"""
+    joypad_mask: int
+    """Bit `id` is set if joypad button `id` is pressed (as signed int16)"""
+
+    threshold: float = 0.5
+    """Buttons are pressed above this value. Applied when a value is written."""
 
     def __init__(self):
+        self._positions = {name: i for i, name in enumerate(self.inputs)}
+
+        self.values = array("h", bytes(2 * self.DEVICES * self.INDICES * self.IDS))
+        self.raw = array("d", bytes(8 * len(self.inputs)))
+
         self.reset()
 
     def __getitem__(self, key: str) -> int | float:
@@ -15,7 +52,7 @@ class InputDevice:
         Returns:
             int | float: Action value. Integers for discrete- and floats for continuous values.
         """
-        return self.state[key]
+        return self.raw[self._positions[key]]
 
     def __setitem__(self, key: str, value: int | float):
         """Set input device's action value.
@@ -24,17 +61,83 @@ class InputDevice:
             key (str): Input name.
             value (int | float): Action value. Should be in range [-1, 1].
         """
-        self.state[key] = value
+        self.raw[self._positions[key]] = value
+
+        for device, index, id in self.inputs[key]:
+            state = self.to_state(device, index, id, value)
+            self.values[self.slot(device, index, id)] = state
+
+            if device == Device.JOYPAD:
+                self.__update_mask(id, state)
+
+    def set_inputs(self, values: Sequence[int | float]):
+        """Set all inputs at once.
+
+        Args:
+            values (Sequence[int | float]): One value per input, in order of `inputs`.
+        """
+        for key, value in zip(self.inputs, values):
+            self[key] = value
+
+    @property
+    def state(self) -> dict[str, int | float]:
+        """Values of all inputs by name (copy)."""
+        return dict(zip(self.inputs, self.raw))
+
+    @classmethod
+    def slot(cls, device: int, index: int, id: int) -> int:
+        """Position of (device, index, id) in `values`."""
+        return (device * cls.INDICES + index) * cls.IDS + id
 
     def reset(self):
         """Resets state of device i.e. sets all inputs to zero."""
+        self.values[:] = array("h", bytes(len(self.values) * 2))
+        self.raw[:] = array("d", bytes(len(self.raw) * 8))
+        self.joypad_mask = 0
+
+    def __update_mask(self, id: int, pressed: int):
+        mask = self.joypad_mask & 0xFFFF
+
+        if pressed:
+            mask |= 1 << id
+        else:
+            mask &= ~(1 << id)
+
+        # Returned through an int16 callback
+        self.joypad_mask = mask - 0x10000 if mask & 0x8000 else mask
+
+    def to_state(self, device: int, index: int, id: int, value: int | float) -> int:
+        """Convert a written value into the libretro state of a slot.
+
+        Args:
+            device (int): Device ID.
+            index (int): Device Index ID.
+            id (int): Device Button ID.
+            value (int | float): Written value.
+
+        Returns:
+            int: State of action (int16).
+        """
+        return int(value)
+
+    def to_button(self, value: int | float) -> int:
+        """Button state of a written value: 1 above `threshold`, else 0."""
+        return int(value > self.threshold)
+
+    @staticmethod
+    def to_axis(value: int | float) -> int:
+        """Axis state of a written value in [-1, 1]: clamped and scaled to [-0x7FFF, 0x7FFF]."""
+        return int(min(max(value, -1.0), 1.0) * 0x7FFF)
+
+    def poll(self):
+        """Called once per frame when the core polls input (e.g. to flush queued events)."""
         ...
 
     def get_state(self, device: int, index: int, id: int) -> int:
         """Get state of action using libretro's API convention.
 
         Note:
-            Conversion to correct value should be handled based of action.
+            Unknown devices and actions are 0.
 
         Args:
             device (int): Device ID.
@@ -44,4 +147,10 @@ class InputDevice:
         Returns:
             int: State of action.
         """
-        ...
+        if device < self.DEVICES and index < self.INDICES and id < self.IDS:
+            return self.values[(device * self.INDICES + index) * self.IDS + id]
+
+        if device == Device.JOYPAD and id == Joypad.MASK:
+            return self.joypad_mask
+
+        return 0
@@ -2,6 +2,12 @@ from ...core.device import Device, Joypad, Analog, AnalogIdx
 from .base import InputDevice
 
 from enum import StrEnum
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 # __iter__() is *in order of declaration* and depended on
@@ -56,30 +62,54 @@ class GamePad(InputDevice):
     Two C-Sticks, 2x2 Shoulder Buttons, 4 Action Buttons, 4 Directional Buttons.
     """
 
-    threshold: float = 0.5
+    def __init__(self):
+        super().__init__()
 
-    def get_state(self, device: int, index: int, id: int) -> int:
-        if device == Device.JOYPAD:
-            # this is done as a hack to keep the dict smaller
-            name = RETRO_INPUT_TO_STR[AnalogIdx.BUTTONS][id]
+        if np is None:
+            return
+
+        # Views of the value stores and gather / scatter tables for `set_inputs`
+        self.__raw_view = np.frombuffer(self.raw, dtype=np.float64)
+        self.__values_view = np.frombuffer(self.values, dtype=np.int16)
+
+        buttons, analogs = [], []
+        for input, slots in self.inputs.items():
+            for device, index, id in slots:
+                entry = (self._positions[input], self.slot(device, index, id), id)
+                (buttons if device == Device.JOYPAD else analogs).append(entry)
 
-            # (-inf, threshold]: 0
-            # ( threshold, inf): 1
-            return int(self.state[name] > self.threshold)
+        buttons, analogs = np.array(buttons), np.array(analogs)
+        self.__button_inputs, self.__button_slots = buttons[:, 0], buttons[:, 1]
+        self.__button_bits = 1 << buttons[:, 2]
+        self.__analog_inputs, self.__analog_slots = analogs[:, 0], analogs[:, 1]
 
-        elif device == Device.ANALOG:
-            name = RETRO_INPUT_TO_STR[index][id]
+    def set_inputs(self, values: Sequence[int | float]):
+        """Set all inputs at once with a few array operations.
 
-            # [-0x7FFF, 0x7FFF]
-            return int(self.state[name] * 0x7FFF)
-        else:
-            raise ValueError(f"device ({device})")
+        Args:
+            values (Sequence[int | float]): One value per input, in order of `GamePadInput`.
+        """
+        if np is None:
+            return super().set_inputs(values)
 
-    def reset(self):
-        self.state = {}
+        raw = self.__raw_view
+        raw[:] = values
 
-        for input in GamePadInput:
-            self.state[input] = 0.0
+        pressed = raw[self.__button_inputs] > self.threshold
+        self.__values_view[self.__button_slots] = pressed
+
+        # Truncation as in `to_axis`
+        analog = np.clip(raw[self.__analog_inputs], -1.0, 1.0) * 0x7FFF
+        self.__values_view[self.__analog_slots] = analog
+
+        mask = int(self.__button_bits @ pressed)
+        self.joypad_mask = mask - 0x10000 if mask & 0x8000 else mask
+
+    def to_state(self, device: int, index: int, id: int, value: int | float) -> int:
+        if device == Device.JOYPAD:
+            return self.to_button(value)
+
+        return self.to_axis(value)
 
 
 RETRO_INPUT_TO_STR = {
@@ -110,3 +140,19 @@ RETRO_INPUT_TO_STR = {
         Joypad.R3: GamePadInput.R3,
     },
 }
+
+
+def _gamepad_inputs() -> dict[GamePadInput, tuple[tuple[int, int, int], ...]]:
+    """Slots of every input, buttons are available digital (JOYPAD) and analog (ANALOG, BUTTONS)."""
+    inputs = {input: [] for input in GamePadInput}
+
+    for index, ids in RETRO_INPUT_TO_STR.items():
+        for id, input in ids.items():
+            if index == AnalogIdx.BUTTONS:
+                inputs[input].append((Device.JOYPAD, 0, id))
+            inputs[input].append((Device.ANALOG, index, id))
+
+    return {input: tuple(slots) for input, slots in inputs.items()}
+
+
+GamePad.inputs = _gamepad_inputs()
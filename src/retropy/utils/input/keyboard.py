@@ -0,0 +1,218 @@
+from ...core.device import Device
+from ...core.device.keyboard import Key, Mod
+from .base import InputDevice
+
+from collections import deque
+from typing import Callable
+
+KEY_COUNT = 324
+"""RETROK_LAST"""
+
+_KEYS = {key.value: key for key in Key}
+"""Key code -> `Key`"""
+
+Event = tuple[bool, int, int]
+"""Key event (down, keycode, character)"""
+
+# Modifier keys and the flag they hold while pressed
+_MODIFIERS = {
+    Key.LSHIFT.value: Mod.SHIFT.value,
+    Key.RSHIFT.value: Mod.SHIFT.value,
+    Key.LCTRL.value: Mod.CTRL.value,
+    Key.RCTRL.value: Mod.CTRL.value,
+    Key.LALT.value: Mod.ALT.value,
+    Key.RALT.value: Mod.ALT.value,
+    Key.LMETA.value: Mod.META.value,
+    Key.RMETA.value: Mod.META.value,
+}
+
+# Characters typed with shift on a US layout -> key
+_SHIFTED = dict(zip('!@#$%^&*()_+{}|:"<>?~', "1234567890-=[]\\;',./`"))
+
+_CONTROL = {
+    "\n": Key.RETURN.value,
+    "\r": Key.RETURN.value,
+    "\t": Key.TAB.value,
+    "\b": Key.BACKSPACE.value,
+}
+
+
+class Keyboard(InputDevice):
+    """Keyboard of computer systems (`RETRO_DEVICE_KEYBOARD`).
+
+    Key events are queued in batches, one batch is applied each time the core polls input:
+    the key map answering `input_state` is updated and the events are sent to the keyboard callback of the core.
+    Pressed keys are kept in a fixed size map, so `input_state` is a single indexed read.
+
+    `press` / `release` add to the next batch, `type` queues every character over two polls,
+    so each key is seen pressed for one frame.
+
+    Examples:
+        >>> core.keyboard.type("RUN\\n")
+        >>> core.keyboard[Key.F1] = 1
+    """
+
+    keys: bytearray
+    """1 if key is pressed, indexed by `Key` value (as seen by the core)"""
+    mods: int
+    """Currently held modifiers (`Mod` flags)"""
+    queue: deque[list[Event]]
+    """Pending events, one batch per input poll"""
+    flushed: list[Event]
+    """Events applied by the last poll"""
+    callback: Callable[[bool, int, int, int], None] | None
+    """`retro_keyboard_event_t` of core (set by `SET_KEYBOARD_CALLBACK`)"""
+
+    def __init__(self):
+        self.keys = bytearray(KEY_COUNT)
+        self.queue = deque()
+        self.flushed = []
+        self.callback = None
+
+        super().__init__()
+
+    def __getitem__(self, key: Key | str | int) -> int:
+        return self.keys[_keycode(key)]
+
+    def __setitem__(self, key: Key | str | int, value: int | float):
+        if value:
+            self.press(key)
+        else:
+            self.release(key)
+
+    @property
+    def state(self) -> dict[Key | int, int]:
+        """Pressed keys. Codes without a `Key` member stay plain ints."""
+        return {
+            _KEYS.get(code, code): 1
+            for code, pressed in enumerate(self.keys)
+            if pressed
+        }
+
+    def set_inputs(self, values):
+        """Set all keys at once (with the next poll).
+
+        Args:
+            values (Sequence[int | float]): One value per key code (`KEY_COUNT`).
+        """
+        for code, value in enumerate(values):
+            if bool(value) != bool(self.keys[code]):
+                self[code] = value
+
+    def press(self, key: Key | str | int, character: int = 0):
+        """Press a key with the next poll.
+
+        Args:
+            key (Key | str | int): Key, its name or its code.
+            character (int, optional): UTF-32 character produced by the key. Defaults to 0.
+        """
+        self.__next_batch().append((True, _keycode(key), character))
+
+    def release(self, key: Key | str | int):
+        """Release a key with the next poll.
+
+        Args:
+            key (Key | str | int): Key, its name or its code.
+        """
+        self.__next_batch().append((False, _keycode(key), 0))
+
+    def type(self, text: str):
+        """Queue press and release of every character, each on its own poll.
+
+        Upper case letters and shifted punctuation (US layout) are typed while holding left shift.
+
+        Args:
+            text (str): Text to type
+        """
+        shift = Key.LSHIFT.value
+
+        for char in text:
+            code, shifted = _key_of(char)
+            shifted = shifted and not self.mods & Mod.SHIFT.value
+
+            if shifted:
+                self.queue.append([(True, shift, 0), (True, code, ord(char))])
+                self.queue.append([(False, code, 0), (False, shift, 0)])
+            else:
+                self.queue.append([(True, code, ord(char))])
+                self.queue.append([(False, code, 0)])
+
+    def poll(self):
+        """Apply the next batch of queued events."""
+        self.apply(self.queue.popleft() if self.queue else [])
+
+    def apply(self, events: list[Event]):
+        """Update key map and send events to the core.
+
+        Args:
+            events (list[Event]): Events of this poll
+        """
+        self.flushed = events
+        callback = self.callback
+
+        for down, code, character in events:
+            self.keys[code] = down
+
+            if code in _MODIFIERS:
+                self.mods = 0
+                for modifier, flag in _MODIFIERS.items():
+                    if self.keys[modifier]:
+                        self.mods |= flag
+
+            if callback:
+                callback(down, code, character, self.mods)
+
+    def restore(self, keys: bytes | bytearray):
+        """Press and release keys with the next poll until the key map equals `keys`, before queued events.
+
+        Args:
+            keys (bytes | bytearray): Key map to return to (see `keys`)
+        """
+        events = [
+            (bool(down), code, 0)
+            for code, (down, held) in enumerate(zip(keys, self.keys))
+            if bool(down) != bool(held)
+        ]
+        if events:
+            self.queue.appendleft(events)
+
+    def reset(self):
+        super().reset()
+        self.keys[:] = bytes(KEY_COUNT)
+        self.queue.clear()
+        self.flushed = []
+        self.mods = 0
+
+    def get_state(self, device: int, index: int, id: int) -> int:
+        if device == Device.KEYBOARD and id < KEY_COUNT:
+            return self.keys[id]
+
+        return 0
+
+    def __next_batch(self) -> list[Event]:
+        if not self.queue:
+            self.queue.append([])
+
+        return self.queue[0]
+
+
+def _key_of(char: str) -> tuple[int, bool]:
+    """Key typing a character and whether shift is needed."""
+    if char in _CONTROL:
+        return _CONTROL[char], False
+    if char in _SHIFTED:
+        return ord(_SHIFTED[char]), True
+    if "A" <= char <= "Z":
+        return ord(char.lower()), True
+    if ord(char) < 128:
+        return ord(char), False
+
+    return Key.UNKNOWN.value, False
+
+
+def _keycode(key: Key | str | int) -> int:
+    if isinstance(key, Key):
+        return key.value
+    if isinstance(key, str):
+        return Key[key].value
+    return key
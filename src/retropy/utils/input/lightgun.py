@@ -0,0 +1,70 @@
+from ...core.device import Device, Lightgun as LightgunId
+from .base import InputDevice
+
+from enum import StrEnum
+
+
+class LightgunInput(StrEnum):
+    SCREEN_X = "SCREEN_X"
+    """Aim - Horizontal ↔ (absolute, [-1, 1] is on screen)"""
+    SCREEN_Y = "SCREEN_Y"
+    """Aim - Vertical ↕ (absolute, [-1, 1] is on screen)"""
+    IS_OFFSCREEN = "IS_OFFSCREEN"
+    """Aiming outside of the screen"""
+    TRIGGER = "TRIGGER"
+    """Trigger"""
+    RELOAD = "RELOAD"
+    """Reload (e.g. shooting off screen)"""
+    AUX_A = "AUX_A"
+    """Auxiliary Button A"""
+    AUX_B = "AUX_B"
+    """Auxiliary Button B"""
+    AUX_C = "AUX_C"
+    """Auxiliary Button C"""
+    START = "START"
+    """START Button"""
+    SELECT = "SELECT"
+    """SELECT Button"""
+    DPAD_UP = "DPAD_UP"
+    """Directional Pad - Up ↑"""
+    DPAD_DOWN = "DPAD_DOWN"
+    """Directional Pad - Down ↓"""
+    DPAD_LEFT = "DPAD_LEFT"
+    """Directional Pad - Left ←"""
+    DPAD_RIGHT = "DPAD_RIGHT"
+    """Directional Pad - Right →"""
+
+
+class Lightgun(InputDevice):
+    """Light gun aiming at absolute screen coordinates (`RETRO_DEVICE_LIGHTGUN`).
+
+    Examples:
+        >>> gun = core.set_controller(0, Device.LIGHTGUN)
+        >>> gun.aim(0.25, -0.5)
+        >>> gun[LightgunInput.TRIGGER] = 1
+    """
+
+    IDS: int = 17
+    """`RETRO_DEVICE_ID_LIGHTGUN_RELOAD` is 16"""
+
+    def aim(self, x: float, y: float):
+        """Point at a screen position. Positions outside of [-1, 1] are off screen.
+
+        Args:
+            x (float): Horizontal position, -1 is the left and 1 the right edge.
+            y (float): Vertical position, -1 is the top and 1 the bottom edge.
+        """
+        self[LightgunInput.SCREEN_X] = x
+        self[LightgunInput.SCREEN_Y] = y
+        self[LightgunInput.IS_OFFSCREEN] = not (-1.0 <= x <= 1.0 and -1.0 <= y <= 1.0)
+
+    def to_state(self, device: int, index: int, id: int, value: int | float) -> int:
+        if id in (LightgunId.SCREEN_X, LightgunId.SCREEN_Y):
+            return self.to_axis(value)
+
+        return self.to_button(value)
+
+
+Lightgun.inputs = {
+    input: ((Device.LIGHTGUN, 0, LightgunId[input.value]),) for input in LightgunInput
+}
@@ -0,0 +1,132 @@
+from ...core.device import Device, Mouse as MouseId
+from .base import InputDevice
+
+from array import array
+from enum import StrEnum
+
+
+class MouseInput(StrEnum):
+    X = "X"
+    """Horizontal movement in pixels (relative)"""
+    Y = "Y"
+    """Vertical movement in pixels (relative)"""
+    LEFT = "LEFT"
+    """Left Button"""
+    RIGHT = "RIGHT"
+    """Right Button"""
+    MIDDLE = "MIDDLE"
+    """Middle Button"""
+    BUTTON_4 = "BUTTON_4"
+    """Side Button - Back"""
+    BUTTON_5 = "BUTTON_5"
+    """Side Button - Forward"""
+    WHEEL_UP = "WHEEL_UP"
+    """Wheel - Up ↑ (relative)"""
+    WHEEL_DOWN = "WHEEL_DOWN"
+    """Wheel - Down ↓ (relative)"""
+    HORIZ_WHEEL_UP = "HORIZ_WHEEL_UP"
+    """Horizontal Wheel - Right → (relative)"""
+    HORIZ_WHEEL_DOWN = "HORIZ_WHEEL_DOWN"
+    """Horizontal Wheel - Left ← (relative)"""
+
+
+class Mouse(InputDevice):
+    """Relative pointing device (`RETRO_DEVICE_MOUSE`).
+
+    Movement and wheel inputs are relative: written values accumulate until the core polls input,
+    are then published as the state of the upcoming frame and start again from zero.
+    Buttons are held like on a `GamePad`.
+
+    Examples:
+        >>> mouse = core.set_controller(0, Device.MOUSE)
+        >>> mouse.move(4, -2)
+        >>> mouse[MouseInput.LEFT] = 1
+    """
+
+    RELATIVE: tuple[MouseInput, ...] = (
+        MouseInput.X,
+        MouseInput.Y,
+        MouseInput.WHEEL_UP,
+        MouseInput.WHEEL_DOWN,
+        MouseInput.HORIZ_WHEEL_UP,
+        MouseInput.HORIZ_WHEEL_DOWN,
+    )
+    """Inputs accumulated between polls"""
+
+    pending: array
+    """Accumulated relative values not yet seen by the core, in order of `RELATIVE`"""
+
+    def __init__(self):
+        self.pending = array("d", bytes(8 * len(self.RELATIVE)))
+
+        super().__init__()
+
+        # Relative input -> (position in `pending`, position in `raw`, slot in `values`)
+        self.__relative = {
+            input: (i, self._positions[input], self.slot(*self.inputs[input][0]))
+            for i, input in enumerate(self.RELATIVE)
+        }
+
+    def __setitem__(self, key: str, value: int | float):
+        relative = self.__relative.get(key)
+        if relative is None:
+            return super().__setitem__(key, value)
+
+        pending, position, _ = relative
+        self.pending[pending] += value
+        self.raw[position] = self.pending[pending]
+
+    def move(self, dx: int | float, dy: int | float):
+        """Move by a distance in pixels.
+
+        Args:
+            dx (int | float): Horizontal distance, positive is right.
+            dy (int | float): Vertical distance, positive is down.
+        """
+        self[MouseInput.X] = dx
+        self[MouseInput.Y] = dy
+
+    def scroll(self, dy: int = 0, dx: int = 0):
+        """Turn the wheels by a number of notches.
+
+        Args:
+            dy (int, optional): Vertical notches, positive is up. Defaults to 0.
+            dx (int, optional): Horizontal notches, positive is right. Defaults to 0.
+        """
+        if dy:
+            self[MouseInput.WHEEL_UP if dy > 0 else MouseInput.WHEEL_DOWN] = abs(dy)
+        if dx:
+            key = MouseInput.HORIZ_WHEEL_UP if dx > 0 else MouseInput.HORIZ_WHEEL_DOWN
+            self[key] = abs(dx)
+
+    def poll(self):
+        """Publish accumulated relative values and reset them."""
+        pending, raw, values = self.pending, self.raw, self.values
+
+        for i, position, slot in self.__relative.values():
+            values[slot] = min(max(int(pending[i]), -0x8000), 0x7FFF)
+            pending[i] = 0.0
+            raw[position] = 0.0
+
+    def reset(self):
+        super().reset()
+        self.pending[:] = array("d", bytes(8 * len(self.pending)))
+
+    def to_state(self, device: int, index: int, id: int, value: int | float) -> int:
+        # Relative inputs are published by `poll`
+        return self.to_button(value)
+
+
+Mouse.inputs = {
+    MouseInput.X: ((Device.MOUSE, 0, MouseId.X),),
+    MouseInput.Y: ((Device.MOUSE, 0, MouseId.Y),),
+    MouseInput.LEFT: ((Device.MOUSE, 0, MouseId.LEFT),),
+    MouseInput.RIGHT: ((Device.MOUSE, 0, MouseId.RIGHT),),
+    MouseInput.MIDDLE: ((Device.MOUSE, 0, MouseId.MIDDLE),),
+    MouseInput.BUTTON_4: ((Device.MOUSE, 0, MouseId.BUTTON_4),),
+    MouseInput.BUTTON_5: ((Device.MOUSE, 0, MouseId.BUTTON_5),),
+    MouseInput.WHEEL_UP: ((Device.MOUSE, 0, MouseId.WHEELUP),),
+    MouseInput.WHEEL_DOWN: ((Device.MOUSE, 0, MouseId.WHEELDOWN),),
+    MouseInput.HORIZ_WHEEL_UP: ((Device.MOUSE, 0, MouseId.HORIZ_WHEELUP),),
+    MouseInput.HORIZ_WHEEL_DOWN: ((Device.MOUSE, 0, MouseId.HORIZ_WHEELDOWN),),
+}
@@ -0,0 +1,77 @@
+from ...core.device import Device, Pointer as PointerId
+from .base import InputDevice
+
+from enum import StrEnum
+
+
+class PointerInput(StrEnum):
+    X = "X"
+    """First touch - Horizontal ↔ (absolute, [-1, 1])"""
+    Y = "Y"
+    """First touch - Vertical ↕ (absolute, [-1, 1])"""
+    PRESSED = "PRESSED"
+    """First touch - Pressed"""
+
+
+class Pointer(InputDevice):
+    """Touch screen or absolute pointer (`RETRO_DEVICE_POINTER`).
+
+    Named inputs belong to the first touch, further touches (up to `INDICES`) are set with `touch`.
+    The number of pressed touches is published when the core polls input.
+
+    Examples:
+        >>> pointer = core.set_controller(0, Device.POINTER)
+        >>> pointer.touch(-0.5, 0.5)
+        >>> pointer.touch(0.5, 0.5, index=1)
+    """
+
+    def touch(self, x: float, y: float, pressed: bool = True, index: int = 0):
+        """Set position and state of a touch.
+
+        Args:
+            x (float): Horizontal position, -1 is the left and 1 the right edge.
+            y (float): Vertical position, -1 is the top and 1 the bottom edge.
+            pressed (bool, optional): Whether the screen is touched. Defaults to True.
+            index (int, optional): Touch (finger), below `INDICES`. Defaults to 0.
+
+        Raises:
+            ValueError: Unsupported touch index
+        """
+        if not 0 <= index < self.INDICES:
+            raise ValueError(f"Touch index {index} not in [0, {self.INDICES})")
+
+        if index == 0:
+            self[PointerInput.X] = x
+            self[PointerInput.Y] = y
+            self[PointerInput.PRESSED] = pressed
+            return
+
+        for id, value in (
+            (PointerId.X, x),
+            (PointerId.Y, y),
+            (PointerId.PRESSED, pressed),
+        ):
+            state = self.to_state(Device.POINTER, index, id, value)
+            self.values[self.slot(Device.POINTER, index, id)] = state
+
+    def poll(self):
+        """Publish number of pressed touches."""
+        values = self.values
+
+        count = 0
+        for index in range(self.INDICES):
+            count += values[self.slot(Device.POINTER, index, PointerId.PRESSED)]
+
+        for index in range(self.INDICES):
+            values[self.slot(Device.POINTER, index, PointerId.COUNT)] = count
+
+    def to_state(self, device: int, index: int, id: int, value: int | float) -> int:
+        if id == PointerId.PRESSED:
+            return self.to_button(value)
+
+        return self.to_axis(value)
+
+
+Pointer.inputs = {
+    input: ((Device.POINTER, 0, PointerId[input.value]),) for input in PointerInput
+}
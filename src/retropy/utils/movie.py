@@ -0,0 +1,397 @@
+# input movies
+
+from __future__ import annotations
+
+import struct
+import zlib
+from array import array
+from ctypes import c_size_t, c_ubyte
+from typing import BinaryIO, Sequence
+
+from ..core.device import Device, Analog, AnalogIdx
+from .input import InputDevice, GamePad, Keyboard, Mouse, Lightgun, Pointer
+from .savestate import Savestate
+
+MAGIC = b"RPYMOVIE"
+VERSION = 2
+
+_HEADER = struct.Struct("<8sHBB")
+"""magic, version, ports, flags (followed by the recorded `Device` of every port)"""
+_FLAG_SAVESTATE = 1
+
+_CHUNK = struct.Struct("<II")
+"""frames, compressed size"""
+
+_RECORD = struct.Struct("<H4h16h")
+"""Joypad record: joypad bitmask, analog sticks (LX, LY, RX, RY), analog buttons"""
+
+_KEY_EVENTS = struct.Struct("<H")
+"""Number of keyboard events of a poll"""
+_KEY_EVENT = struct.Struct("<BHI")
+"""Keyboard event: down, keycode, character"""
+
+# Devices which can be recorded; all values of the device are stored unless it is a joypad
+_DEVICES: dict[Device, type[InputDevice]] = {
+    Device.JOYPAD: GamePad,
+    Device.MOUSE: Mouse,
+    Device.LIGHTGUN: Lightgun,
+    Device.POINTER: Pointer,
+}
+
+_AXES = (
+    (AnalogIdx.LEFT_STICK, Analog.X),
+    (AnalogIdx.LEFT_STICK, Analog.Y),
+    (AnalogIdx.RIGHT_STICK, Analog.X),
+    (AnalogIdx.RIGHT_STICK, Analog.Y),
+)
+
+
+class MovieRecorder:
+    """
+    Records the input state of every port once per input poll (usually once per frame).
+
+    The device of every port is stored in the header. Joypads are stored as 42 byte records (bit-packed buttons,
+    int16 analog values), mice, light guns and pointers with all their int16 values.
+    Keyboard events applied by the poll follow the ports.
+    Records are collected in chunks which are zlib compressed, so idle inputs cost almost nothing.
+    A movie starts either from an embedded savestate or from power-on (reset).
+
+    Examples:
+        >>> with core.record_movie("episode.rpym") as movie:
+        ...     for _ in range(1000):
+        ...         core.frame_advance()
+        >>> for _ in core.replay_movie("episode.rpym", render=False):
+        ...     pass
+    """
+
+    frames: int
+    """Number of recorded polls (frames)"""
+    devices: tuple[Device, ...]
+    """Recorded device of every port"""
+
+    def __init__(
+        self,
+        path: str,
+        controllers: Sequence[InputDevice],
+        savestate: Savestate = None,
+        chunk_frames: int = 600,
+        level: int = 6,
+    ):
+        """Create movie file.
+
+        Args:
+            path (str): Output file
+            controllers (Sequence[InputDevice]): Controllers by port
+            savestate (Savestate, optional): State the movie starts from. None means power-on. Defaults to None.
+            chunk_frames (int, optional): Frames per compressed chunk. Defaults to 600.
+            level (int, optional): zlib compression level. Defaults to 6.
+
+        Raises:
+            ValueError: A controller cannot be recorded
+        """
+        self.devices = tuple(recorded_device(controller) for controller in controllers)
+        self.ports = len(self.devices)
+        self.chunk_frames = chunk_frames
+        self.level = level
+        self.frames = 0
+
+        self.__file: BinaryIO = open(path, "wb")
+        self.__chunk = bytearray()
+        self.__chunk_count = 0
+
+        flags = _FLAG_SAVESTATE if savestate is not None else 0
+        self.__file.write(_HEADER.pack(MAGIC, VERSION, self.ports, flags))
+        self.__file.write(bytes(self.devices))
+
+        if savestate is not None:
+            state = zlib.compress(savestate.buffer, level)
+            self.__file.write(struct.pack("<I", len(state)))
+            self.__file.write(state)
+
+    # region context
+
+    def __enter__(self) -> "MovieRecorder":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # endregion
+
+    @property
+    def closed(self) -> bool:
+        """Whether the file is finished. A closed recorder is detached by the core."""
+        return self.__file.closed
+
+    def on_frame(self, controllers: Sequence[InputDevice], keyboard: Keyboard):
+        """Record input state of the upcoming frame. Called by `RetroPy.input_poll` after the controllers polled.
+
+        Does nothing once `closed`.
+
+        Args:
+            controllers (Sequence[InputDevice]): Controllers by port
+            keyboard (Keyboard): Keyboard, its `flushed` events are recorded
+        """
+        if self.__file.closed:
+            return
+
+        for port, device in enumerate(self.devices):
+            if device == Device.JOYPAD:
+                self.__chunk += pack_record(controllers[port])
+            elif device != Device.NONE:
+                self.__chunk += pack_values(controllers[port], device)
+
+        self.__chunk += _KEY_EVENTS.pack(len(keyboard.flushed))
+        for event in keyboard.flushed:
+            self.__chunk += _KEY_EVENT.pack(*event)
+
+        self.frames += 1
+        self.__chunk_count += 1
+
+        if self.__chunk_count >= self.chunk_frames:
+            self.__flush()
+
+    def close(self):
+        """Write remaining frames and close file."""
+        if self.__file.closed:
+            return
+
+        self.__flush()
+        self.__file.close()
+
+    def __flush(self):
+        if not self.__chunk_count:
+            return
+
+        data = zlib.compress(self.__chunk, self.level)
+        self.__file.write(_CHUNK.pack(self.__chunk_count, len(data)))
+        self.__file.write(data)
+
+        self.__chunk.clear()
+        self.__chunk_count = 0
+
+
+class MoviePlayer:
+    """
+    Replays a movie recorded by `MovieRecorder` into the controllers.
+
+    Chunks are decompressed one at a time while playing.
+    """
+
+    ports: int
+    """Number of recorded controllers"""
+    devices: tuple[Device, ...]
+    """Recorded device of every port"""
+    savestate: Savestate | None
+    """State the movie starts from. None means power-on."""
+    frame: int
+    """Number of frames played"""
+
+    def __init__(self, path: str):
+        """Open movie file.
+
+        Args:
+            path (str): Movie file
+
+        Raises:
+            ValueError: Not a movie or unsupported version
+        """
+        self.__file: BinaryIO = open(path, "rb")
+
+        magic, version, self.ports, flags = _HEADER.unpack(
+            self.__file.read(_HEADER.size)
+        )
+        if magic != MAGIC or version != VERSION:
+            self.__file.close()
+            raise ValueError(f"{path} is not a supported movie")
+
+        self.devices = tuple(Device(device) for device in self.__file.read(self.ports))
+
+        self.savestate = None
+        if flags & _FLAG_SAVESTATE:
+            (size,) = struct.unpack("<I", self.__file.read(4))
+            data = zlib.decompress(self.__file.read(size))
+
+            self.savestate = Savestate()
+            self.savestate.size = c_size_t(len(data))
+            self.savestate.data = (c_ubyte * len(data)).from_buffer_copy(data)
+
+        self.frame = 0
+
+        self.__chunk = b""
+        self.__offset = 0
+
+    # region context
+
+    def __enter__(self) -> "MoviePlayer":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # endregion
+
+    @property
+    def closed(self) -> bool:
+        """Whether the file is closed. A closed player is detached by the core."""
+        return self.__file.closed
+
+    @property
+    def finished(self) -> bool:
+        """Whether all frames were played."""
+        return self.__offset >= len(self.__chunk) and not self.__read_chunk()
+
+    def on_frame(self, controllers: Sequence[InputDevice], keyboard: Keyboard):
+        """Write recorded input state of the upcoming frame into the controllers. Called by `RetroPy.input_poll` after the controllers polled.
+
+        Controllers are left untouched once the movie is `finished` or `closed`.
+
+        Args:
+            controllers (Sequence[InputDevice]): Controllers by port, of the recorded `devices`
+            keyboard (Keyboard): Keyboard, recorded events are applied to it
+        """
+        if self.__file.closed or self.finished:
+            return
+
+        for port, device in enumerate(self.devices):
+            if device == Device.JOYPAD:
+                unpack_record(controllers[port], self.__chunk, self.__offset)
+                self.__offset += _RECORD.size
+            elif device != Device.NONE:
+                self.__offset += unpack_values(
+                    controllers[port], device, self.__chunk, self.__offset
+                )
+
+        (count,) = _KEY_EVENTS.unpack_from(self.__chunk, self.__offset)
+        self.__offset += _KEY_EVENTS.size
+
+        events = []
+        for _ in range(count):
+            down, code, character = _KEY_EVENT.unpack_from(self.__chunk, self.__offset)
+            events.append((bool(down), code, character))
+            self.__offset += _KEY_EVENT.size
+        keyboard.apply(events)
+
+        self.frame += 1
+
+    def close(self):
+        """Close file."""
+        self.__file.close()
+
+    def __read_chunk(self) -> bool:
+        header = self.__file.read(_CHUNK.size)
+        if len(header) < _CHUNK.size:
+            return False
+
+        _, size = _CHUNK.unpack(header)
+        self.__chunk = zlib.decompress(self.__file.read(size))
+        self.__offset = 0
+
+        return True
+
+
+def recorded_device(controller: InputDevice) -> Device:
+    """Device a controller is recorded as.
+
+    Args:
+        controller (InputDevice): Controller
+
+    Raises:
+        ValueError: Controller cannot be recorded
+
+    Returns:
+        Device: Recorded device, `Device.NONE` for idle controllers
+    """
+    for device, cls in _DEVICES.items():
+        if isinstance(controller, cls):
+            return device
+
+    if type(controller) is InputDevice:
+        return Device.NONE
+
+    raise ValueError(f"{type(controller).__name__} cannot be recorded in movies")
+
+
+def pack_record(controller: InputDevice) -> bytes:
+    """Input state of a controller as movie record.
+
+    Args:
+        controller (InputDevice): Controller
+
+    Returns:
+        bytes: Packed record
+    """
+    values = controller.values
+    buttons = controller.slot(Device.ANALOG, AnalogIdx.BUTTONS, 0)
+
+    return _RECORD.pack(
+        controller.joypad_mask & 0xFFFF,
+        *(values[controller.slot(Device.ANALOG, index, id)] for index, id in _AXES),
+        *values[buttons : buttons + 16],
+    )
+
+
+def unpack_record(controller: InputDevice, data: bytes, offset: int = 0):
+    """Write a movie record into a controller.
+
+    Args:
+        controller (InputDevice): Controller
+        data (bytes): Movie chunk
+        offset (int, optional): Position of record in `data`. Defaults to 0.
+    """
+    record = _RECORD.unpack_from(data, offset)
+    mask = record[0]
+    values = controller.values
+
+    joypad = controller.slot(Device.JOYPAD, 0, 0)
+    for id in range(16):
+        values[joypad + id] = (mask >> id) & 1
+    controller.joypad_mask = mask - 0x10000 if mask & 0x8000 else mask
+
+    for (index, id), value in zip(_AXES, record[1:5]):
+        values[controller.slot(Device.ANALOG, index, id)] = value
+
+    buttons = controller.slot(Device.ANALOG, AnalogIdx.BUTTONS, 0)
+    for id, value in enumerate(record[5:]):
+        values[buttons + id] = value
+
+
+def pack_values(controller: InputDevice, device: Device) -> bytes:
+    """All values of a device as movie record.
+
+    Args:
+        controller (InputDevice): Controller
+        device (Device): Recorded device
+
+    Returns:
+        bytes: Packed record
+    """
+    start, stop = _device_range(device)
+    return controller.values[start:stop].tobytes()
+
+
+def unpack_values(
+    controller: InputDevice, device: Device, data: bytes, offset: int = 0
+) -> int:
+    """Write a record of `pack_values` into a controller.
+
+    Args:
+        controller (InputDevice): Controller
+        device (Device): Recorded device
+        data (bytes): Movie chunk
+        offset (int, optional): Position of record in `data`. Defaults to 0.
+
+    Returns:
+        int: Size of record
+    """
+    start, stop = _device_range(device)
+    size = (stop - start) * controller.values.itemsize
+
+    controller.values[start:stop] = array("h", data[offset : offset + size])
+    return size
+
+
+def _device_range(device: Device) -> tuple[int, int]:
+    """Positions of all values of a device in `InputDevice.values`."""
+    cls = _DEVICES[device]
+    return cls.slot(device, 0, 0), cls.slot(device + 1, 0, 0)
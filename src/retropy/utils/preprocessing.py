@@ -0,0 +1,424 @@
+# observation preprocessing
+
+from __future__ import annotations
+
+from ctypes import c_void_p
+from enum import Enum
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..core.renderer.framebuffer import PixelFormat
+from .video import rgb_lut, pixel_to_rgb, raw_framebuffer, _XRGB8888_RGB
+
+LUMA_BT601 = (0.299, 0.587, 0.114)
+"""Luma weights of ITU-R BT.601 (RGB order)"""
+
+_GRAY_LUT: dict[tuple, np.ndarray] = {}
+
+
+class FramePreprocessing:
+    """
+    Observation preprocessing fused into the frame conversion.
+
+    Cropping and subsampling are applied to the raw framebuffer before any pixel is converted,
+    and grayscale frames are gathered from a lookup table, so the full resolution RGB frame is never created.
+
+    Order: crop -> downscale -> color conversion -> resize -> dtype
+
+    Examples:
+        >>> core.preprocessing = FramePreprocessing(grayscale=True, resize=(84, 84))
+        >>> frame = core.frame_advance() # -> (84, 84) uint8
+    """
+
+    crop: Tuple[int, int, int, int] | None
+    """Rectangle (top, left, height, width) to keep."""
+    weights: Tuple[float, float, float] | None
+    """RGB weights of grayscale conversion. None keeps RGB."""
+    downscale: Tuple[int, int]
+    """Keep every n-th pixel (height, width)."""
+    resize: Tuple[int, int] | None
+    """Area-averaged output size (height, width)."""
+    dtype: np.dtype
+    """Output dtype. Float frames are scaled to [0, 1]."""
+
+    def __init__(
+        self,
+        crop: Tuple[int, int, int, int] = None,
+        grayscale: bool | Tuple[float, float, float] = False,
+        downscale: int | Tuple[int, int] = 1,
+        resize: Tuple[int, int] = None,
+        dtype: np.dtype = None,
+    ):
+        """Create preprocessing specification.
+
+        Args:
+            crop (Tuple[int, int, int, int], optional): Rectangle (top, left, height, width) to keep. Defaults to None.
+            grayscale (bool | Tuple[float, float, float], optional): Convert to grayscale using BT.601 luma or custom RGB weights. Defaults to False.
+            downscale (int | Tuple[int, int], optional): Integer subsampling factor (height, width). Defaults to 1.
+            resize (Tuple[int, int], optional): Area-average to (height, width) after subsampling. Defaults to None.
+            dtype (np.dtype, optional): Output dtype. Float frames are scaled to [0, 1]. Defaults to np.uint8.
+        """
+        if isinstance(downscale, int):
+            downscale = (downscale, downscale)
+
+        if grayscale is True:
+            grayscale = LUMA_BT601
+
+        self.crop = tuple(crop) if crop else None
+        self.weights = tuple(grayscale) if grayscale else None
+        self.downscale = tuple(downscale)
+        self.resize = tuple(resize) if resize else None
+        self.dtype = np.dtype(dtype or np.uint8)
+
+        # (height, width) of input -> (row weights, column weights)
+        self.__resize_matrices = {}
+
+    def output_shape(self, height: int, width: int) -> tuple[int, ...]:
+        """Shape of preprocessed frames.
+
+        Args:
+            height (int): Height of raw frame
+            width (int): Width of raw frame
+
+        Returns:
+            tuple[int, ...]: `H x W` if grayscale else `H x W x 3`
+        """
+        if self.resize:
+            height, width = self.resize
+        else:
+            if self.crop:
+                height, width = self.crop[2:]
+
+            # ceil division, same as slicing with a step
+            height = -(-height // self.downscale[0])
+            width = -(-width // self.downscale[1])
+
+        return (height, width) if self.weights else (height, width, 3)
+
+    def apply(
+        self,
+        data: c_void_p | np.ndarray,
+        shape: Tuple[int, int, int],
+        format: PixelFormat,
+        out: np.ndarray = None,
+    ) -> np.ndarray:
+        """Convert raw framebuffer into preprocessed frame.
+
+        Args:
+            data (c_void_p | np.ndarray): Data received by core or array owning the framebuffer
+            shape (Tuple[int, int, int]): Shape of buffer (height, width, pitch)
+            format (PixelFormat): color format for raw buffer
+            out (np.ndarray, optional): Frame to write into. Reallocated if shape or dtype do not match. Defaults to None.
+
+        Returns:
+            np.ndarray: Preprocessed frame (`out` if it was reused)
+        """
+        height, width, pitch = shape
+
+        out_shape = self.output_shape(height, width)
+        if out is None or out.shape != out_shape or out.dtype != self.dtype:
+            out = np.empty(out_shape, dtype=self.dtype)
+
+        top, left, h, w = self.crop or (0, 0, height, width)
+        rows = slice(top, top + h, self.downscale[0])
+        cols = slice(left, left + w, self.downscale[1])
+
+        # Only the final stage writes into `out`; everything before works on (strided) views
+        direct = self.resize is None
+
+        raw = raw_framebuffer(data, height, pitch)
+
+        if format == PixelFormat.XRGB8888:
+            rgb = raw.reshape((height, pitch // 4, 4))[rows, cols, _XRGB8888_RGB]
+
+            if self.weights:
+                values = rgb @ np.asarray(self.weights, dtype=np.float32)
+            else:
+                values = rgb
+        else:
+            pixels = raw.view(np.uint16)[rows, cols]
+
+            if self.weights:
+                if direct:
+                    # Gather final values in a single pass
+                    lut = gray_lut(format, self.weights, self.dtype)
+                    np.take(lut, pixels, out=out, mode="wrap")
+
+                    if self.dtype.kind == "f":
+                        out *= 1 / 255
+
+                    return out
+
+                values = np.take(
+                    gray_lut(format, self.weights, np.float32), pixels, mode="wrap"
+                )
+            else:
+                values = np.take(rgb_lut(format), pixels, mode="wrap")
+                values = values.view(np.uint8).reshape(pixels.shape + (4,))[:, :, :3]
+
+        if not direct:
+            rows_m, cols_m = self.__resize_matrix(values.shape[0], values.shape[1])
+
+            # (oh, h) @ (h, w * c) -> (oh, w, c); (ow, w) @ (oh, w, c) -> (oh, ow, c)
+            channels = 1 if values.ndim == 2 else 3
+            values = rows_m @ values.reshape((values.shape[0], -1)).astype(np.float32)
+            values = cols_m @ values.reshape((values.shape[0], -1, channels))
+            values = values.reshape(out_shape)
+
+        if self.dtype.kind == "f":
+            np.multiply(values, 1 / 255, out=out, casting="unsafe")
+        elif values.dtype.kind == "f":
+            np.rint(values, out=values)
+            np.copyto(out, values, casting="unsafe")
+        else:
+            np.copyto(out, values, casting="unsafe")
+
+        return out
+
+    def __resize_matrix(self, height: int, width: int) -> tuple[np.ndarray, np.ndarray]:
+        """Area-average weights for rows and columns. Cached per input size."""
+        matrices = self.__resize_matrices.get((height, width), None)
+
+        if matrices is None:
+            matrices = (
+                area_weights(height, self.resize[0]),
+                area_weights(width, self.resize[1]),
+            )
+            self.__resize_matrices[(height, width)] = matrices
+
+        return matrices
+
+
+def area_weights(size: int, target: int) -> np.ndarray:
+    """Matrix which area-averages a 1D signal of length `size` to length `target`.
+
+    Args:
+        size (int): Input length
+        target (int): Output length
+
+    Returns:
+        np.ndarray: `target x size` float32 matrix, rows sum up to 1
+    """
+    scale = size / target
+    edges = np.arange(target + 1) * scale
+    pixels = np.arange(size)
+
+    start = np.maximum(edges[:-1, None], pixels[None, :])
+    stop = np.minimum(edges[1:, None], pixels[None, :] + 1)
+
+    return (np.clip(stop - start, 0, None) / scale).astype(np.float32)
+
+
+def gray_lut(
+    format: PixelFormat, weights: Tuple[float, float, float], dtype: np.dtype
+) -> np.ndarray:
+    """Lookup table mapping every 16 bit pixel value to its grayscale value.
+
+    Values are in range [0, 255] and rounded for integer dtypes.
+    The table is built once per pixel format, weights and dtype and cached afterwards.
+
+    Args:
+        format (PixelFormat): 16 bit color format (RGB1555 or RGB565)
+        weights (Tuple[float, float, float]): RGB weights
+        dtype (np.dtype): dtype of table
+
+    Returns:
+        np.ndarray: Table with 65536 entries
+    """
+    dtype = np.dtype(dtype)
+    key = (format, weights, dtype)
+    lut = _GRAY_LUT.get(key, None)
+
+    if lut is None:
+        red, green, blue = pixel_to_rgb(np.arange(1 << 16, dtype=np.uint32), format)
+        gray = red * weights[0] + green * weights[1] + blue * weights[2]
+
+        if dtype.kind != "f":
+            gray = np.rint(gray)
+
+        lut = gray.astype(dtype)
+
+        _GRAY_LUT[key] = lut
+
+    return lut
+
+
+class AudioFeature(Enum):
+    """Kind of audio observation produced by `AudioPreprocessing`."""
+
+    RMS = 0
+    """Root mean square per channel, shape `2`"""
+    SPECTROGRAM = 1
+    """Log magnitude STFT of the mono mix, shape `frames x (n_fft // 2 + 1)`"""
+    MEL = 2
+    """Log mel power spectrogram of the mono mix, shape `frames x n_mels`"""
+    PCM = 3
+    """Raw samples scaled to [-1, 1], shape `window x 2`"""
+
+
+class AudioPreprocessing:
+    """
+    Fixed size audio features of the samples collected during a step.
+
+    Only the most recent `window` frames are used, shorter steps are zero padded in front.
+    All STFT frames of a step are transformed in a single batched FFT.
+
+    Examples:
+        >>> env = RetroGym(core, rom, audio=AudioPreprocessing(AudioFeature.MEL, n_mels=32))
+        >>> observation["audio"].shape # -> (5, 32) with 800 samples per step
+    """
+
+    feature: AudioFeature
+    """Kind of feature"""
+    window: int | None
+    """Number of stereo frames per step. None lets the environment derive it from the timing."""
+    n_fft: int
+    """STFT frame length"""
+    hop: int
+    """Distance of STFT frames"""
+    n_mels: int
+    """Number of mel bands"""
+
+    def __init__(
+        self,
+        feature: AudioFeature = AudioFeature.MEL,
+        window: int = None,
+        n_fft: int = 256,
+        hop: int = 128,
+        n_mels: int = 32,
+    ):
+        """Create audio preprocessing specification.
+
+        Args:
+            feature (AudioFeature, optional): Kind of feature. Defaults to AudioFeature.MEL.
+            window (int, optional): Number of stereo frames per step. Defaults to None (samples per step).
+            n_fft (int, optional): STFT frame length. Defaults to 256.
+            hop (int, optional): Distance of STFT frames. Defaults to 128.
+            n_mels (int, optional): Number of mel bands. Defaults to 32.
+        """
+        self.feature = feature
+        self.window = window
+        self.n_fft = n_fft
+        self.hop = hop
+        self.n_mels = n_mels
+
+        self.__hann = np.hanning(n_fft).astype(np.float32)
+        self.__samples: np.ndarray = None
+        # sample rate -> filterbank
+        self.__filterbanks = {}
+
+    def output_shape(self, window: int) -> tuple[int, ...]:
+        """Shape of features.
+
+        Args:
+            window (int): Number of stereo frames per step
+
+        Returns:
+            tuple[int, ...]: Shape of `apply` result
+        """
+        if self.feature == AudioFeature.RMS:
+            return (2,)
+        if self.feature == AudioFeature.PCM:
+            return (window, 2)
+
+        frames = 1 + max(window - self.n_fft, 0) // self.hop
+        if self.feature == AudioFeature.MEL:
+            return (frames, self.n_mels)
+        return (frames, self.n_fft // 2 + 1)
+
+    def bounds(self) -> tuple[float, float]:
+        """Lower and upper bound of feature values (for observation spaces)."""
+        if self.feature == AudioFeature.PCM:
+            return (-1.0, 1.0)
+        if self.feature == AudioFeature.RMS:
+            return (0.0, 1.0)
+        return (0.0, np.inf)
+
+    def apply(
+        self,
+        audio: np.ndarray,
+        window: int,
+        sample_rate: float,
+        out: np.ndarray = None,
+    ) -> np.ndarray:
+        """Compute features of the audio of a step.
+
+        Args:
+            audio (np.ndarray): `N x 2` int16 frames (e.g. `RetroPy.drain_audio()`)
+            window (int): Number of stereo frames per step
+            sample_rate (float): Sample rate of `audio`
+            out (np.ndarray, optional): Array to write into. Reallocated if shape does not match. Defaults to None.
+
+        Returns:
+            np.ndarray: float32 features (`out` if it was reused)
+        """
+        out_shape = self.output_shape(window)
+        if out is None or out.shape != out_shape or out.dtype != np.float32:
+            out = np.empty(out_shape, dtype=np.float32)
+
+        # STFT needs at least one full frame
+        length = window if self.feature == AudioFeature.PCM else max(window, self.n_fft)
+        if self.__samples is None or len(self.__samples) != length:
+            self.__samples = np.empty((length, 2), dtype=np.float32)
+
+        samples = self.__samples
+        count = min(len(audio), window)
+        samples[: length - count] = 0
+        samples[length - count :] = audio[len(audio) - count :]
+        samples *= 1 / 32768
+
+        if self.feature == AudioFeature.PCM:
+            out[:] = samples
+            return out
+
+        if self.feature == AudioFeature.RMS:
+            # Padding would dilute the mean
+            tail = samples[length - max(count, 1) :]
+            np.sqrt(np.mean(np.square(tail), axis=0), out=out)
+            return out
+
+        mono = samples.mean(axis=1)
+        frames = np.lib.stride_tricks.sliding_window_view(mono, self.n_fft)[:: self.hop]
+        spectrum = np.abs(np.fft.rfft(frames * self.__hann, axis=1))
+
+        if self.feature == AudioFeature.MEL:
+            spectrum = np.square(spectrum) @ self.__filterbank(sample_rate)
+
+        np.log1p(spectrum, out=out, casting="unsafe")
+        return out
+
+    def __filterbank(self, sample_rate: float) -> np.ndarray:
+        """Mel filterbank for the sample rate. Cached per sample rate."""
+        filterbank = self.__filterbanks.get(sample_rate, None)
+
+        if filterbank is None:
+            filterbank = mel_filterbank(sample_rate, self.n_fft, self.n_mels)
+            self.__filterbanks[sample_rate] = filterbank
+
+        return filterbank
+
+
+def mel_filterbank(sample_rate: float, n_fft: int, n_mels: int) -> np.ndarray:
+    """Triangular filters equally spaced on the (HTK) mel scale between 0 and nyquist.
+
+    Args:
+        sample_rate (float): Sample rate of signal
+        n_fft (int): STFT frame length
+        n_mels (int): Number of bands
+
+    Returns:
+        np.ndarray: `(n_fft // 2 + 1) x n_mels` float32 matrix
+    """
+    nyquist_mel = 2595 * np.log10(1 + sample_rate / 2 / 700)
+    points = 700 * (10 ** (np.linspace(0, nyquist_mel, n_mels + 2) / 2595) - 1)
+    frequencies = np.fft.rfftfreq(n_fft, 1 / sample_rate)[:, None]
+
+    lower, center, upper = points[:-2], points[1:-1], points[2:]
+    rising = (frequencies - lower) / (center - lower)
+    falling = (upper - frequencies) / (upper - center)
+
+    return np.clip(np.minimum(rising, falling), 0, None).astype(np.float32)
@@ -0,0 +1,336 @@
+# video recording
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from ctypes import Array, c_ubyte, memmove
+from enum import Enum
+from fractions import Fraction
+from pathlib import Path
+from typing import BinaryIO, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..core.renderer.framebuffer import PixelFormat
+from .video import buffer_to_frame
+
+# Full range BT.601 (JPEG) RGB -> YCbCr
+_YUV_MATRIX = (
+    (0.299, 0.587, 0.114),
+    (-0.168736, -0.331264, 0.5),
+    (0.5, -0.418688, -0.081312),
+)
+_YUV_OFFSET = (0.0, 128.0, 128.0)
+
+
+class RecordingFormat(Enum):
+    """Container written by `VideoRecorder`."""
+
+    Y4M = 0
+    """YUV4MPEG2 stream (4:4:4, full range). Requires numpy and a constant frame size."""
+    RAW = 1
+    """Headerless RGB24 frames plus `<path>.idx` text index (frame, offset, width, height)."""
+
+
+class DropPolicy(Enum):
+    """What to do if the writer cannot keep up and the queue is full."""
+
+    BLOCK = 0
+    """Wait until the writer frees a slot (back-pressure, no frame is lost)."""
+    DROP_NEWEST = 1
+    """Discard the incoming frame."""
+    DROP_OLDEST = 2
+    """Discard the oldest queued frame and enqueue the incoming one."""
+
+
+class VideoRecorder:
+    """
+    Streams frames to disk on a background thread.
+
+    The emulation thread only copies the raw framebuffer into a preallocated slot and enqueues it.
+    Color conversion and file I/O happen on the writer thread.
+    Slots are recycled, so no memory is allocated while recording at a constant resolution.
+
+    Examples:
+        >>> with VideoRecorder("episode.y4m", fps=core.system_av_info().timing.fps) as recorder:
+        ...     core.recorder = recorder
+        ...     for _ in range(1000):
+        ...         core.frame_advance()
+        >>> recorder.written, recorder.dropped
+    """
+
+    path: Path
+    """Output file"""
+    format: RecordingFormat
+    """Container format"""
+    policy: DropPolicy
+    """Behaviour if queue is full"""
+    written: int
+    """Number of frames written to disk (including repeated dupes)"""
+    dropped: int
+    """Number of frames discarded (full queue, size changes in Y4M)"""
+
+    def __init__(
+        self,
+        path: str,
+        format: RecordingFormat = RecordingFormat.Y4M,
+        fps: float = 60.0,
+        queue_size: int = 64,
+        policy: DropPolicy = DropPolicy.BLOCK,
+    ):
+        """Create recorder. Writing starts with `start` or when entering the context.
+
+        Args:
+            path (str): Output file. The index of raw recordings is written next to it with an added `.idx` suffix.
+            format (RecordingFormat, optional): Container format. Defaults to RecordingFormat.Y4M.
+            fps (float, optional): Frame rate stored in Y4M header. Defaults to 60.0.
+            queue_size (int, optional): Number of frames which can be pending. Defaults to 64.
+            policy (DropPolicy, optional): Behaviour if queue is full. Defaults to DropPolicy.BLOCK.
+
+        Raises:
+            ValueError: Y4M requires numpy
+        """
+        if format == RecordingFormat.Y4M and np is None:
+            raise ValueError("Y4M recording requires numpy")
+
+        self.path = Path(path)
+        self.format = format
+        self.fps = Fraction(fps).limit_denominator(1001)
+        self.policy = policy
+
+        self.written = 0
+        self.dropped = 0
+
+        # Slots cycle between `__free` (emulation thread) and `__pending` (writer thread)
+        self.__slots: list[Array[c_ubyte]] = [
+            (c_ubyte * 0)() for _ in range(queue_size)
+        ]
+        self.__free = queue.Queue()
+        self.__pending = queue.Queue()
+        for slot in range(queue_size):
+            self.__free.put(slot)
+
+        self.__frame = 0
+        self.__lock = threading.Lock()
+        self.__thread: threading.Thread = None
+        self.__error: BaseException = None
+
+    # region context
+
+    def __enter__(self) -> "VideoRecorder":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # endregion
+
+    @property
+    def running(self) -> bool:
+        """Whether the writer thread accepts frames."""
+        return self.__thread is not None and self.__error is None
+
+    def start(self):
+        """Open output and start writer thread."""
+        if self.__thread is not None:
+            return
+
+        self.__thread = threading.Thread(
+            target=self.__write_loop, name="VideoRecorder", daemon=True
+        )
+        self.__thread.start()
+
+    def close(self):
+        """Write all pending frames and close output.
+
+        Raises:
+            Exception: Error which stopped the writer thread
+        """
+        if self.__thread is None:
+            return
+
+        self.__pending.put(None)
+        self.__thread.join()
+        self.__thread = None
+
+        if self.__error is not None:
+            raise self.__error
+
+    def push(self, data, shape: Tuple[int, int, int], format: PixelFormat) -> bool:
+        """Enqueue a raw frame. Called from `RetroPy.video_refresh`.
+
+        Args:
+            data (c_void_p): Framebuffer of core. None repeats the previous frame (dupe).
+            shape (Tuple[int, int, int]): Shape of buffer (height, width, pitch)
+            format (PixelFormat): color format of raw buffer
+
+        Returns:
+            bool: Whether the frame was enqueued
+        """
+        frame = self.__frame
+        self.__frame += 1
+
+        if not self.running:
+            self.__drop()
+            return False
+
+        slot = self.__acquire()
+        if slot is None:
+            self.__drop()
+            return False
+
+        if data:
+            size = shape[0] * shape[2]
+            if len(self.__slots[slot]) < size:
+                self.__slots[slot] = (c_ubyte * size)()
+
+            memmove(self.__slots[slot], data, size)
+        else:
+            shape = None
+
+        self.__pending.put((slot, frame, shape, format))
+        return True
+
+    def __acquire(self) -> int | None:
+        """Get free slot according to `policy`."""
+        if self.policy == DropPolicy.BLOCK:
+            return self.__free.get()
+
+        while True:
+            try:
+                return self.__free.get_nowait()
+            except queue.Empty:
+                pass
+
+            if self.policy == DropPolicy.DROP_NEWEST:
+                return None
+
+            # Steal the oldest pending frame; if the writer was faster, a slot is free again
+            try:
+                item = self.__pending.get_nowait()
+            except queue.Empty:
+                continue
+
+            if item is None:
+                # Recorder is closing, keep the sentinel last
+                self.__pending.put(None)
+                return None
+
+            self.__drop()
+            return item[0]
+
+    def __drop(self):
+        with self.__lock:
+            self.dropped += 1
+
+    # region writer thread
+
+    def __write_loop(self):
+        try:
+            with open(self.path, "wb") as file:
+                if self.format == RecordingFormat.RAW:
+                    with open(f"{self.path}.idx", "w") as index:
+                        index.write("# frame offset width height\n")
+                        self.__consume(file, index)
+                else:
+                    self.__consume(file, None)
+        except BaseException as e:
+            self.__error = e
+            logging.error("VideoRecorder: %s", e)
+
+            # Unblock and count everything still queued
+            while True:
+                item = self.__pending.get()
+                if item is None:
+                    break
+                self.__drop()
+                self.__free.put(item[0])
+
+    def __consume(self, file: BinaryIO, index: TextIO | None):
+        header = False
+        geometry = None
+        frame_data = None  # Last written frame (RGB bytes for raw, YUV planes for Y4M)
+        offset = 0
+        last_offset = None
+
+        while True:
+            item = self.__pending.get()
+            if item is None:
+                return
+
+            slot, frame, shape, format = item
+
+            if shape is not None:
+                height, width, pitch = shape
+                rgb = buffer_to_frame(
+                    self.__slots[slot], shape, format, numpy=np is not None
+                )
+                self.__free.put(slot)
+
+                if self.format == RecordingFormat.Y4M:
+                    if not header:
+                        rate = f"{self.fps.numerator}:{self.fps.denominator}"
+                        file.write(
+                            f"YUV4MPEG2 W{width} H{height} F{rate} Ip A1:1 C444 XCOLORRANGE=FULL\n".encode()
+                        )
+                        geometry = (width, height)
+                        header = True
+                    elif geometry != (width, height):
+                        # Y4M cannot change frame size mid stream
+                        self.__drop()
+                        continue
+
+                    frame_data = rgb_to_yuv444(rgb)
+                else:
+                    geometry = (width, height)
+                    # numpy frames are views of padded pixels
+                    frame_data = rgb if np is None else np.ascontiguousarray(rgb)
+                    last_offset = offset
+            else:
+                # Dupe: repeat previous frame
+                self.__free.put(slot)
+
+                if frame_data is None:
+                    self.__drop()
+                    continue
+
+            if self.format == RecordingFormat.Y4M:
+                file.write(b"FRAME\n")
+                file.write(frame_data)
+            else:
+                # Dupes of raw recordings only add an index entry
+                if shape is not None:
+                    file.write(frame_data)
+                    offset += memoryview(frame_data).nbytes
+
+                index.write(f"{frame} {last_offset} {geometry[0]} {geometry[1]}\n")
+
+            with self.__lock:
+                self.written += 1
+
+    # endregion
+
+
+def rgb_to_yuv444(rgb: np.ndarray) -> bytes:
+    """Convert RGB frame into planar full range YUV 4:4:4 (Y, U and V planes).
+
+    Args:
+        rgb (np.ndarray): `H x W x 3` uint8 frame
+
+    Returns:
+        bytes: Y, U, V planes with `H x W` bytes each
+    """
+    matrix = np.asarray(_YUV_MATRIX, dtype=np.float32)
+    yuv = np.tensordot(matrix, rgb.astype(np.float32), axes=((1,), (2,)))
+    yuv += np.asarray(_YUV_OFFSET, dtype=np.float32)[:, None, None]
+
+    np.rint(yuv, out=yuv)
+    np.clip(yuv, 0, 255, out=yuv)
+
+    return yuv.astype(np.uint8).tobytes()
@@ -1,14 +1,46 @@
 from ctypes import Array, c_ubyte, c_size_t
+from enum import Enum
+from typing import BinaryIO
+import lzma
 import os
+import struct
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .exceptions import SavestateError
+
+MAGIC = b"RPYSTATE"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sBBQ")
+"""magic, version, compression, uncompressed size"""
+
+_CHUNK_SIZE = 1 << 20
+"""Bytes streamed per step"""
+
+
+class Compression(Enum):
+    """Codec of savestate files."""
+
+    NONE = 0
+    """Plain state without header (compatible with other frontends)"""
+    ZLIB = 1
+    """zlib (deflate), fast"""
+    LZMA = 2
+    """lzma (xz), smaller but slower"""
 
 
 class Savestate:
     """Saves complete state of emulator to later return to."""
 
     data: Array[c_ubyte]
-    """Emulator state in bytes as ctypes array"""
+    """Emulator state in bytes as ctypes array (may be larger than `size`)"""
     size: c_size_t
-    """Length of `data`"""
+    """Length of the state in `data`"""
 
     def __init__(self, size: int = None):
         """Initialized a savestate.
@@ -22,28 +54,280 @@ class Savestate:
         else:
             self.size = None
 
-    def write(self, path: str):
+    @property
+    def buffer(self) -> memoryview:
+        """State bytes (view of `data`)."""
+        return memoryview(self.data).cast("B")[: self.size.value]
+
+    def reserve(self, size: int):
+        """Resize state, the buffer is only reallocated if it is too small.
+
+        Args:
+            size (int): Number of bytes of the state
+        """
+        if self.size is None or len(self.data) < size:
+            self.data = (c_ubyte * size)()
+            self.size = c_size_t(size)
+        else:
+            self.size.value = size
+
+    def write(
+        self, path: str, compression: Compression = Compression.NONE, level: int = None
+    ):
         """Write savestate to file
 
+        Compressed states start with a header recording codec and size, they are compressed in chunks while writing.
+
         Args:
             path (str): Path to file
+            compression (Compression, optional): Codec. Defaults to Compression.NONE.
+            level (int, optional): zlib level (0-9) or lzma preset (0-9). Defaults to the codec's default.
         """
         with open(path, "wb") as f:
-            f.write(self.data)
+            if compression == Compression.NONE:
+                f.write(self.buffer)
+                return
+
+            f.write(_HEADER.pack(MAGIC, VERSION, compression.value, self.size.value))
+
+            if compression == Compression.ZLIB:
+                compressor = zlib.compressobj(-1 if level is None else level)
+            else:
+                compressor = lzma.LZMACompressor(preset=level)
+
+            view = self.buffer
+            for offset in range(0, len(view), _CHUNK_SIZE):
+                f.write(compressor.compress(view[offset : offset + _CHUNK_SIZE]))
+            f.write(compressor.flush())
 
     def read(self, path: str) -> "Savestate":
         """Read savestate from file
 
+        Plain and compressed states are detected by their header. Data is read / decompressed
+        in chunks directly into `data`, which is reused if large enough.
+
         Args:
             path (str): Path to file
 
+        Raises:
+            SavestateError: Unsupported version or truncated file
+
         Returns:
             Savestate: loaded state information
         """
         with open(path, "rb") as f:
-            f.seek(0, os.SEEK_END)
-            self.size = f.tell()
-            f.seek(0, os.SEEK_SET)
-            self.data = (c_ubyte * self.size).from_buffer_copy(f.read())
+            header = f.read(_HEADER.size)
+
+            if len(header) < _HEADER.size or header[:8] != MAGIC:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(0, os.SEEK_SET)
+
+                self.reserve(size)
+                f.readinto(self.buffer)
+                return self
+
+            _, version, codec, size = _HEADER.unpack(header)
+            if version != VERSION:
+                raise SavestateError(f"{path}: unsupported savestate version {version}")
+
+            self.reserve(size)
+            _decompress_into(f, Compression(codec), self.buffer)
 
         return self
+
+
+def _decompress_into(file: BinaryIO, compression: Compression, view: memoryview):
+    """Stream compressed data of file into view, producing at most one chunk at a time."""
+    if compression == Compression.ZLIB:
+        decompressor = zlib.decompressobj()
+    else:
+        decompressor = lzma.LZMADecompressor()
+
+    offset = 0
+    while offset < len(view):
+        # Input left over from a previous step is processed before reading more
+        if compression == Compression.ZLIB:
+            data = decompressor.unconsumed_tail or file.read(_CHUNK_SIZE)
+        else:
+            data = file.read(_CHUNK_SIZE) if decompressor.needs_input else b""
+
+        chunk = decompressor.decompress(data, min(len(view) - offset, _CHUNK_SIZE))
+        if not chunk and not data:
+            raise SavestateError(f"{file.name}: savestate is truncated")
+
+        view[offset : offset + len(chunk)] = chunk
+        offset += len(chunk)
+
+
+class SavestatePool:
+    """
+    Reusable savestate buffers.
+
+    Search based agents snapshot thousands of times per second. Serializing into buffers of the pool
+    avoids allocating a new buffer for every state.
+
+    Examples:
+        >>> pool = core.savestate_pool(8)
+        >>> state = core.save_state(into=pool.acquire())
+        >>> core.load_state(state)
+        >>> pool.release(state)
+    """
+
+    size: int
+    """Number of bytes of new buffers"""
+
+    def __init__(self, size: int, count: int = 0):
+        """Create pool.
+
+        Args:
+            size (int): Number of bytes of every buffer (`RetroPy.serialize_size`)
+            count (int, optional): Number of buffers allocated up front. Defaults to 0.
+        """
+        self.size = size
+        self.__free = [Savestate(size) for _ in range(count)]
+
+    def __len__(self) -> int:
+        """Number of free buffers."""
+        return len(self.__free)
+
+    def acquire(self) -> Savestate:
+        """Take a free buffer, a new one is allocated if none is left.
+
+        Returns:
+            Savestate: Buffer with undefined content
+        """
+        if self.__free:
+            return self.__free.pop()
+
+        return Savestate(self.size)
+
+    def release(self, savestate: Savestate):
+        """Return a buffer which is no longer used.
+
+        Args:
+            savestate (Savestate): Buffer taken by `acquire`
+        """
+        self.__free.append(savestate)
+
+
+class DeltaSavestate:
+    """
+    Savestate stored as difference to a base state (requires numpy).
+
+    Successive states of a game differ in few bytes. Changed bytes are grouped into runs
+    (unchanged gaps of up to `gap` bytes are merged, as every run costs 8 bytes) and stored as XOR against the base.
+    Encoding and decoding are a handful of vectorized array operations.
+
+    The base must not be modified while deltas refer to it.
+
+    Examples:
+        >>> base = core.save_state()
+        >>> delta = DeltaSavestate(core.save_state(into=scratch), base)
+        >>> core.load_state(delta.decode(into=scratch))
+    """
+
+    base: Savestate
+    """Reference state"""
+    size: int
+    """Length of the encoded state"""
+    starts: "np.ndarray"
+    """Start of every run (uint32)"""
+    lengths: "np.ndarray"
+    """Length of every run (uint32)"""
+    data: "np.ndarray"
+    """XOR of state and base of all runs, concatenated (uint8). Bytes beyond the base are stored as is."""
+
+    def __init__(self, state: Savestate, base: Savestate, gap: int = 8):
+        """Encode state.
+
+        Args:
+            state (Savestate): State to encode, it is not referenced afterwards (can be reused).
+            base (Savestate): Reference state
+            gap (int, optional): Unchanged bytes between two changes which still form a single run. Defaults to 8.
+        """
+        self.base = base
+
+        current = np.frombuffer(state.buffer, dtype=np.uint8)
+        reference = np.frombuffer(base.buffer, dtype=np.uint8)
+        self.size = len(current)
+        common = min(len(current), len(reference))
+
+        changed = _changed(current[:common], reference[:common])
+        if len(changed):
+            breaks = np.flatnonzero(np.diff(changed) > gap + 1) + 1
+            first = changed[np.r_[0, breaks]]
+            last = changed[np.r_[breaks - 1, len(changed) - 1]]
+            starts, lengths = first, last - first + 1
+        else:
+            starts = lengths = np.empty(0, dtype=np.intp)
+
+        index = _run_indices(starts, lengths)
+        data = current[index] ^ reference[index]
+
+        # A state larger than its base keeps the tail as a final run
+        if self.size > common:
+            starts = np.r_[starts, common]
+            lengths = np.r_[lengths, self.size - common]
+            data = np.concatenate((data, current[common:]))
+
+        self.starts = starts.astype(np.uint32)
+        self.lengths = lengths.astype(np.uint32)
+        self.data = data
+
+    def __len__(self) -> int:
+        """Number of runs."""
+        return len(self.starts)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the delta (without base)."""
+        return self.starts.nbytes + self.lengths.nbytes + self.data.nbytes
+
+    def decode(self, into: Savestate = None) -> Savestate:
+        """Reconstruct the state.
+
+        Args:
+            into (Savestate, optional): Existing savestate to overwrite, must not be `base`. Defaults to a new savestate.
+
+        Returns:
+            Savestate: Decoded state (`into` if given)
+        """
+        if into is None:
+            into = Savestate(self.size)
+        else:
+            into.reserve(self.size)
+
+        output = np.frombuffer(into.buffer, dtype=np.uint8)
+        reference = np.frombuffer(self.base.buffer, dtype=np.uint8)
+        common = min(self.size, len(reference))
+
+        output[:common] = reference[:common]
+        output[common:] = 0
+
+        output[_run_indices(self.starts, self.lengths)] ^= self.data
+        return into
+
+
+def _changed(current: "np.ndarray", reference: "np.ndarray") -> "np.ndarray":
+    """Positions of differing bytes, compared 8 bytes at a time."""
+    words = len(current) // 8 * 8
+    changed = np.flatnonzero(
+        current[:words].view(np.uint64) != reference[:words].view(np.uint64)
+    )
+
+    # Bytes of changed words, then the remaining bytes
+    positions = (changed[:, None] * 8 + np.arange(8)).ravel()
+    positions = positions[current[positions] != reference[positions]]
+    tail = np.flatnonzero(current[words:] != reference[words:]) + words
+
+    return np.concatenate((positions, tail))
+
+
+def _run_indices(starts: "np.ndarray", lengths: "np.ndarray") -> "np.ndarray":
+    """Positions of all bytes covered by runs, in order of runs."""
+    lengths = lengths.astype(np.intp)
+    offsets = np.cumsum(lengths) - lengths  # start of each run in the concatenated data
+
+    total = int(lengths.sum())
+    return np.arange(total) + np.repeat(starts.astype(np.intp) - offsets, lengths)
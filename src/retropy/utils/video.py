@@ -1,18 +1,56 @@
 # video utilities
 
-from ctypes import c_void_p, c_uint32, c_uint16, POINTER, cast
-from typing import Tuple, List
+from __future__ import annotations
+
+import sys
+from ctypes import c_void_p, c_uint8, POINTER, cast, string_at
+from enum import Enum
+from typing import Tuple, Union
 
 try:
     import numpy as np
 except ImportError:
-    # np = None
-    pass
+    np = None
 
 from ..core.renderer.framebuffer import PixelFormat
 
-Frame = np.ndarray | List[List[Tuple[int, int, int]]]
-"""Type alias for video frame"""
+Frame = Union["np.ndarray", bytearray]
+"""Type alias for video frame. Without numpy, a flat `bytearray` of RGB pixels row after row."""
+
+# Pixels are stored as native integers, so the byte order of the channels depends on the platform
+if sys.byteorder == "little":
+    _XRGB8888_RGB = slice(2, None, -1)
+    _XRGB8888_OFFSETS = (2, 1, 0)
+    _HIGH_BYTE = 1
+else:
+    _XRGB8888_RGB = slice(1, 4)
+    _XRGB8888_OFFSETS = (1, 2, 3)
+    _HIGH_BYTE = 0
+
+
+class FrameLayout(Enum):
+    """Memory layout of converted frames. Anything other than `HWC` requires numpy."""
+
+    HWC = 0
+    """`H x W x 3` uint8 RGB"""
+    WHC = 1
+    """`W x H x 3` uint8 RGB, same order as `pygame.surfarray`"""
+    RGBA = 2
+    """`H x W` packed uint32, bytes are R, G, B, A (255) in memory order"""
+    BGRA = 3
+    """`H x W` packed uint32, bytes are B, G, R, A (255) in memory order"""
+
+
+# Byte positions of R, G, B inside a packed pixel and whether alpha is set
+_LAYOUT_CHANNELS = {
+    FrameLayout.HWC: ([0, 1, 2], False),
+    FrameLayout.WHC: ([0, 1, 2], False),
+    FrameLayout.RGBA: ([0, 1, 2], True),
+    FrameLayout.BGRA: ([2, 1, 0], True),
+}
+
+_RGB_LUT: dict[tuple[PixelFormat, FrameLayout], np.ndarray] = {}
+_RGB_BYTE_TABLES: dict[PixelFormat, tuple[tuple[bytes, bytes], ...]] = {}
 
 
 def buffer_to_frame(
@@ -20,43 +58,266 @@ def buffer_to_frame(
     shape: Tuple[int, int, int],
     format: PixelFormat,
     numpy: bool = True,
+    out: Frame = None,
+    layout: FrameLayout = FrameLayout.HWC,
+    bottom_up: bool = False,
 ) -> Frame:
-    """Convert void* array into usable python list / np array.
+    """Convert void* array into usable python bytearray / np array.
 
-    Uses `Height x Width x Channels` convention.
+    Uses `Height x Width x Channels` convention unless another `layout` is requested.
 
     Args:
-        data (c_void_p): Data received by core
+        data (c_void_p | np.ndarray): Data received by core or array owning the framebuffer (numpy only)
         shape (Tuple[int, int, int]): Shape of buffer (height, width, pitch)
         format (PixelFormat): color format for raw buffer
         numpy (bool, optional): If numpy should be used. Defaults to True.
+        out (Frame, optional): Frame to write into, e.g. returned by a previous call or `empty_frame`. A new frame is allocated if missing or its geometry does not match. Defaults to None.
+        layout (FrameLayout, optional): Memory layout of frame. Defaults to FrameLayout.HWC.
+        bottom_up (bool, optional): Store last row first, as expected by OpenGL (numpy only). Defaults to False.
+
+    Raises:
+        ValueError: Layout requires numpy
 
     Returns:
-        Frame: Converted video frame
+        Frame: Converted video frame (`out` if it was reused)
     """
-    if format == PixelFormat.XRGB8888:
-        ptr = cast(data, POINTER(c_uint32))
-        width_p = shape[2] // 4
-    else:
-        ptr = cast(data, POINTER(c_uint16))
-        width_p = shape[2] // 2
+    height, width, pitch = shape
 
     if numpy:
-        frame = np.ctypeslib.as_array(ptr, shape=(shape[0], width_p))[
-            0 : shape[0], 0 : shape[1]
-        ]
-        frame = np.dstack(pixel_to_rgb(frame, format)).astype(np.uint8)
+        if out is None or out.shape != frame_shape(height, width, layout):
+            out = empty_frame(height, width, layout)
+
+        raw = raw_framebuffer(data, height, pitch)
+
+        if bottom_up:
+            raw = raw[::-1]
+
+        if format == PixelFormat.XRGB8888:
+            if layout == FrameLayout.BGRA and sys.byteorder == "little":
+                # Already in memory order B, G, R, X
+                np.bitwise_or(raw.view(np.uint32)[:, :width], 0xFF000000, out=out)
+                return out
+
+            # Pick RGB channels straight from the bytes, no arithmetic needed
+            rgb = raw.reshape((height, pitch // 4, 4))[:, :width, _XRGB8888_RGB]
+
+            if layout == FrameLayout.WHC:
+                rgb = rgb.transpose((1, 0, 2))
+
+            if layout in (FrameLayout.HWC, FrameLayout.WHC):
+                np.copyto(out, rgb)
+            else:
+                positions, _ = _LAYOUT_CHANNELS[layout]
+                channels = out.view(np.uint8).reshape(out.shape + (4,))
+                channels[:, :, positions] = rgb
+                channels[:, :, 3] = 0xFF
+        else:
+            raw = raw.view(np.uint16)[:, :width]
+
+            if layout == FrameLayout.WHC:
+                raw = raw.T
+
+            lut = rgb_lut(format, layout)
+
+            if layout in (FrameLayout.RGBA, FrameLayout.BGRA):
+                pixels = out
+            else:
+                pixels = _packed_pixels(out)
+
+            # Indices are uint16, so "wrap" never alters them but skips numpy's bounds buffering
+            if pixels is not None:
+                np.take(lut, raw, out=pixels, mode="wrap")
+            else:
+                pixels = np.take(lut, raw, mode="wrap")
+                np.copyto(
+                    out, pixels.view(np.uint8).reshape(out.shape[:2] + (4,))[:, :, :3]
+                )
+
+        frame = out
     else:
-        frame = []
-        for h in range(shape[0]):
-            frame.append([])
-            for w in range(shape[1]):
-                pixel: int = ptr[h * width_p + w]
-                frame[h].append(pixel_to_rgb(pixel, format))
+        if layout != FrameLayout.HWC or bottom_up:
+            raise ValueError(f"layout ({layout}, bottom_up={bottom_up}) requires numpy")
+
+        size = height * width * 3
+        if not isinstance(out, bytearray) or len(out) != size:
+            out = bytearray(size)
+
+        raw = string_at(data, height * pitch)
+
+        if format == PixelFormat.XRGB8888:
+            if pitch != width * 4:
+                raw = b"".join(
+                    raw[h * pitch : h * pitch + width * 4] for h in range(height)
+                )
+
+            # Strided slice assignments interleave the channels at C speed
+            red, green, blue = _XRGB8888_OFFSETS
+            out[0::3] = raw[red::4]
+            out[1::3] = raw[green::4]
+            out[2::3] = raw[blue::4]
+        else:
+            if pitch != width * 2:
+                raw = b"".join(
+                    raw[h * pitch : h * pitch + width * 2] for h in range(height)
+                )
+
+            # Every channel is assembled from both bytes of a pixel by translating them
+            # separately and merging the (disjoint) bits with a single big integer OR
+            high, low = raw[_HIGH_BYTE::2], raw[1 - _HIGH_BYTE :: 2]
+
+            for channel, (high_table, low_table) in enumerate(rgb_byte_tables(format)):
+                bits = int.from_bytes(high.translate(high_table), "little")
+                bits |= int.from_bytes(low.translate(low_table), "little")
+                out[channel::3] = bits.to_bytes(len(high), "little")
+
+        frame = out
 
     return frame
 
 
+def raw_framebuffer(data: c_void_p | np.ndarray, height: int, pitch: int) -> np.ndarray:
+    """Byte view of a raw framebuffer.
+
+    Args:
+        data (c_void_p | np.ndarray): Data received by core or array owning the framebuffer
+        height (int): Height of buffer
+        pitch (int): Length of buffer line in bytes
+
+    Returns:
+        np.ndarray: `height x pitch` uint8 array sharing memory with `data`
+    """
+    if isinstance(data, np.ndarray):
+        return data.reshape((height, -1)).view(np.uint8)
+
+    return np.ctypeslib.as_array(cast(data, POINTER(c_uint8)), (height, pitch))
+
+
+def frame_shape(
+    height: int, width: int, layout: FrameLayout = FrameLayout.HWC
+) -> tuple[int, ...]:
+    """Shape of converted frames.
+
+    Args:
+        height (int): Height of frame
+        width (int): Width of frame
+        layout (FrameLayout, optional): Memory layout of frame. Defaults to FrameLayout.HWC.
+
+    Returns:
+        tuple[int, ...]: Shape of frame
+    """
+    if layout == FrameLayout.WHC:
+        return (width, height, 3)
+    if layout in (FrameLayout.RGBA, FrameLayout.BGRA):
+        return (height, width)
+
+    return (height, width, 3)
+
+
+def empty_frame(
+    height: int, width: int, layout: FrameLayout = FrameLayout.HWC
+) -> np.ndarray:
+    """Allocate a frame which `buffer_to_frame` can write into.
+
+    Gathering whole pixels is much faster than gathering single channels,
+    so 3 channel frames are a view into a buffer padded to 4 channels.
+
+    Args:
+        height (int): Height of frame
+        width (int): Width of frame
+        layout (FrameLayout, optional): Memory layout of frame. Defaults to FrameLayout.HWC.
+
+    Returns:
+        np.ndarray: Uninitialized frame
+    """
+    shape = frame_shape(height, width, layout)
+
+    if len(shape) == 2:
+        return np.empty(shape, dtype=np.uint32)
+
+    return np.empty(shape[:2] + (4,), dtype=np.uint8)[:, :, :3]
+
+
+def _packed_pixels(frame: np.ndarray) -> np.ndarray | None:
+    """Packed uint32 pixels backing a 3 channel frame created by `empty_frame`.
+
+    Args:
+        frame (np.ndarray): `H x W x 3` or `W x H x 3` frame
+
+    Returns:
+        np.ndarray | None: uint32 view without channel axis or None if frame is not padded
+    """
+    base = frame.base
+
+    if (
+        base is None
+        or base.dtype != np.uint8
+        or base.shape != frame.shape[:2] + (4,)
+        or not base.flags.c_contiguous
+        or base.ctypes.data != frame.ctypes.data
+    ):
+        return None
+
+    return base.view(np.uint32).reshape(frame.shape[:2])
+
+
+def rgb_lut(format: PixelFormat, layout: FrameLayout = FrameLayout.HWC) -> np.ndarray:
+    """Lookup table mapping every 16 bit pixel value to a packed pixel.
+
+    Each entry is a packed uint32 whose bytes are ordered as given by `layout`.
+    3 channel layouts leave the fourth byte at zero.
+    The table is built once per pixel format and layout and cached afterwards.
+
+    Args:
+        format (PixelFormat): 16 bit color format (RGB1555 or RGB565)
+        layout (FrameLayout, optional): Byte order of packed pixels. Defaults to FrameLayout.HWC.
+
+    Returns:
+        np.ndarray: uint32 table with 65536 entries
+    """
+    lut = _RGB_LUT.get((format, layout), None)
+
+    if lut is None:
+        positions, alpha = _LAYOUT_CHANNELS[layout]
+
+        pixels = np.arange(1 << 16, dtype=np.uint32)
+        channels = np.zeros((1 << 16, 4), dtype=np.uint8)
+        channels[:, positions] = np.stack(pixel_to_rgb(pixels, format), axis=-1)
+        if alpha:
+            channels[:, 3] = 0xFF
+
+        lut = channels.view(np.uint32).reshape(-1)
+        _RGB_LUT[(format, layout)] = lut
+
+    return lut
+
+
+def rgb_byte_tables(format: PixelFormat) -> tuple[tuple[bytes, bytes], ...]:
+    """Translation tables (see `bytes.translate`) splitting 16 bit pixels into RGB bytes. Used without numpy.
+
+    Each channel is a shifted and masked part of the pixel, so it can be computed from the high and low byte independently and combined with a bitwise OR.
+    The tables are built once per pixel format and cached afterwards.
+
+    Args:
+        format (PixelFormat): 16 bit color format (RGB1555 or RGB565)
+
+    Returns:
+        tuple[tuple[bytes, bytes], ...]: (high byte table, low byte table) for red, green and blue
+    """
+    tables = _RGB_BYTE_TABLES.get(format, None)
+
+    if tables is None:
+        high = [pixel_to_rgb(byte << 8, format) for byte in range(256)]
+        low = [pixel_to_rgb(byte, format) for byte in range(256)]
+
+        tables = tuple(
+            (bytes(rgb[channel] for rgb in high), bytes(rgb[channel] for rgb in low))
+            for channel in range(3)
+        )
+        _RGB_BYTE_TABLES[format] = tables
+
+    return tables
+
+
 def pixel_to_rgb(
     pixel: int | np.ndarray, format: PixelFormat
 ) -> np.ndarray | Tuple[int, int, int]:
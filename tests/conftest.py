@@ -0,0 +1,91 @@
+# Resolve relative import
+from pathlib import Path
+import ctypes
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(str((Path(__file__) / ".." / ".." / "src").resolve()))
+
+from retropy import RetroPy
+
+CORE_SOURCE = Path(__file__).parent / "core" / "test_core.c"
+LOG_FRAMES = 4096
+"""Length of the input logs of the test core"""
+
+
+@pytest.fixture(scope="session")
+def core_path(tmp_path_factory) -> str:
+    """Test core compiled from `core/test_core.c`."""
+    compiler = shutil.which("cc") or shutil.which("gcc") or shutil.which("clang")
+    if compiler is None:
+        pytest.skip("C compiler required to build the test core")
+
+    path = tmp_path_factory.mktemp("core") / "test_core.so"
+    subprocess.run(
+        [compiler, "-shared", "-fPIC", "-O1", "-o", str(path), str(CORE_SOURCE)],
+        check=True,
+    )
+    return str(path)
+
+
+class CoreGlobals:
+    """Globals exported by the test core (same library as loaded by `RetroPy`)."""
+
+    def __init__(self, path: str):
+        self.lib = ctypes.CDLL(path)
+
+    @property
+    def frame(self) -> int:
+        return ctypes.c_uint32.in_dll(self.lib, "test_frame").value
+
+    @property
+    def hash(self) -> int:
+        return ctypes.c_uint32.in_dll(self.lib, "test_hash").value
+
+    def joypad(self, start: int, stop: int) -> list[int]:
+        """Joypad buttons seen by the core in frames [start, stop)."""
+        joypad = (ctypes.c_uint16 * LOG_FRAMES).in_dll(self.lib, "test_joypad")
+        return joypad[start:stop]
+
+    def keys(self, start: int, stop: int) -> list[tuple[int, int, int, int]]:
+        """State of keys a, b, 1 and left shift seen by the core in frames [start, stop)."""
+        keys = (ctypes.c_uint8 * 4 * LOG_FRAMES).in_dll(self.lib, "test_keys")
+        return [tuple(frame) for frame in keys[start:stop]]
+
+    def mouse(self, start: int, stop: int) -> list[tuple[int, int]]:
+        """Mouse motion (x, y) of port 1 seen by the core in frames [start, stop)."""
+        mouse = (ctypes.c_int16 * 2 * LOG_FRAMES).in_dll(self.lib, "test_mouse")
+        return [tuple(frame) for frame in mouse[start:stop]]
+
+    @property
+    def key_events(self) -> list[tuple[int, int, int, int, int]]:
+        """Events received by the keyboard callback (frame, down, keycode, character, modifiers)."""
+        count = ctypes.c_uint32.in_dll(self.lib, "test_key_event_count").value
+        events = (ctypes.c_uint32 * 5 * 256).in_dll(self.lib, "test_key_events")
+        return [tuple(event) for event in events[:count]]
+
+
+@pytest.fixture
+def core_globals(core_path) -> CoreGlobals:
+    return CoreGlobals(core_path)
+
+
+@pytest.fixture
+def rom(tmp_path) -> str:
+    path = tmp_path / "game.bin"
+    path.write_bytes(bytes(16))
+    return str(path)
+
+
+@pytest.fixture
+def core(core_path, rom) -> RetroPy:
+    core = RetroPy(core_path)
+    core.load(rom)
+    core.set_controller(0)
+
+    yield core
+
+    core.stop_movie()
@@ -0,0 +1,216 @@
+/*
+ * Minimal libretro core for the test suite.
+ *
+ * Every frame it polls input and logs what `input_state` returned, so tests can
+ * compare the input seen by the core. The log and a running hash of it are
+ * exported as globals (read with ctypes) and the frame counter and hash are
+ * part of the savestate.
+ */
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#define RETRO_DEVICE_JOYPAD 1
+#define RETRO_DEVICE_MOUSE 2
+#define RETRO_DEVICE_KEYBOARD 3
+
+#define RETRO_ENVIRONMENT_SET_PIXEL_FORMAT 10
+#define RETRO_ENVIRONMENT_SET_KEYBOARD_CALLBACK 12
+
+#define WIDTH 8
+#define HEIGHT 8
+#define LOG_FRAMES 4096
+#define LOG_KEYS 4
+#define LOG_EVENTS 256
+
+typedef bool (*retro_environment_t)(unsigned cmd, void *data);
+typedef void (*retro_video_refresh_t)(const void *data, unsigned width, unsigned height, size_t pitch);
+typedef void (*retro_audio_sample_t)(int16_t left, int16_t right);
+typedef size_t (*retro_audio_sample_batch_t)(const int16_t *data, size_t frames);
+typedef void (*retro_input_poll_t)(void);
+typedef int16_t (*retro_input_state_t)(unsigned port, unsigned device, unsigned index, unsigned id);
+typedef void (*retro_keyboard_event_t)(bool down, unsigned keycode, uint32_t character, uint16_t key_modifiers);
+
+struct retro_keyboard_callback {
+    retro_keyboard_event_t callback;
+};
+
+struct retro_system_info {
+    const char *library_name;
+    const char *library_version;
+    const char *valid_extensions;
+    bool need_fullpath;
+    bool block_extract;
+};
+
+struct retro_system_av_info {
+    unsigned base_width, base_height, max_width, max_height;
+    float aspect_ratio;
+    double fps, sample_rate;
+};
+
+static retro_environment_t environ_cb;
+static retro_video_refresh_t video_cb;
+static retro_audio_sample_batch_t audio_batch_cb;
+static retro_input_poll_t input_poll_cb;
+static retro_input_state_t input_state_cb;
+
+static uint16_t framebuffer[HEIGHT * WIDTH];
+static int16_t audio[2 * 4];
+
+/* Exported for tests */
+uint32_t test_frame;
+uint32_t test_hash;
+uint16_t test_joypad[LOG_FRAMES];
+
+/* Keys queried with RETRO_DEVICE_KEYBOARD every frame: a, b, 1, left shift */
+const unsigned test_watched_keys[LOG_KEYS] = {97, 98, 49, 304};
+uint8_t test_keys[LOG_FRAMES][LOG_KEYS];
+
+/* Relative motion of the mouse in port 1 every frame: x, y */
+int16_t test_mouse[LOG_FRAMES][2];
+
+/* Keyboard callback events: frame, down, keycode, character, modifiers */
+uint32_t test_key_events[LOG_EVENTS][5];
+uint32_t test_key_event_count;
+
+static void keyboard_event(bool down, unsigned keycode, uint32_t character, uint16_t key_modifiers)
+{
+    if (test_key_event_count < LOG_EVENTS) {
+        uint32_t *event = test_key_events[test_key_event_count++];
+        event[0] = test_frame;
+        event[1] = down;
+        event[2] = keycode;
+        event[3] = character;
+        event[4] = key_modifiers;
+    }
+
+    test_hash = test_hash * 31 + (down ? keycode : ~keycode);
+}
+
+static void log_input(void)
+{
+    uint16_t joypad = 0;
+    for (unsigned id = 0; id < 16; id++)
+        if (input_state_cb(0, RETRO_DEVICE_JOYPAD, 0, id))
+            joypad |= 1 << id;
+
+    test_joypad[test_frame % LOG_FRAMES] = joypad;
+    test_hash = test_hash * 31 + joypad;
+
+    for (unsigned i = 0; i < LOG_KEYS; i++) {
+        uint8_t pressed = input_state_cb(0, RETRO_DEVICE_KEYBOARD, 0, test_watched_keys[i]) != 0;
+        test_keys[test_frame % LOG_FRAMES][i] = pressed;
+        test_hash = test_hash * 31 + pressed;
+    }
+
+    for (unsigned id = 0; id < 2; id++) {
+        int16_t motion = input_state_cb(1, RETRO_DEVICE_MOUSE, 0, id);
+        test_mouse[test_frame % LOG_FRAMES][id] = motion;
+        test_hash = test_hash * 31 + (uint16_t)motion;
+    }
+}
+
+void retro_set_environment(retro_environment_t cb) { environ_cb = cb; }
+void retro_set_video_refresh(retro_video_refresh_t cb) { video_cb = cb; }
+void retro_set_audio_sample(retro_audio_sample_t cb) { (void)cb; }
+void retro_set_audio_sample_batch(retro_audio_sample_batch_t cb) { audio_batch_cb = cb; }
+void retro_set_input_poll(retro_input_poll_t cb) { input_poll_cb = cb; }
+void retro_set_input_state(retro_input_state_t cb) { input_state_cb = cb; }
+
+void retro_init(void) {}
+void retro_deinit(void) {}
+unsigned retro_api_version(void) { return 1; }
+
+void retro_get_system_info(struct retro_system_info *info)
+{
+    info->library_name = "test";
+    info->library_version = "1";
+    info->valid_extensions = "bin";
+    info->need_fullpath = true;
+    info->block_extract = false;
+}
+
+void retro_get_system_av_info(struct retro_system_av_info *info)
+{
+    info->base_width = info->max_width = WIDTH;
+    info->base_height = info->max_height = HEIGHT;
+    info->aspect_ratio = 0.0f;
+    info->fps = 60.0;
+    info->sample_rate = 240.0;
+}
+
+void retro_set_controller_port_device(unsigned port, unsigned device) { (void)port; (void)device; }
+
+void retro_reset(void)
+{
+    test_frame = 0;
+    test_hash = 0;
+}
+
+void retro_run(void)
+{
+    input_poll_cb();
+    log_input();
+
+    test_frame++;
+
+    for (unsigned i = 0; i < WIDTH * HEIGHT; i++)
+        framebuffer[i] = (uint16_t)(i + test_frame);
+
+    video_cb(framebuffer, WIDTH, HEIGHT, WIDTH * sizeof(uint16_t));
+    audio_batch_cb(audio, 4);
+}
+
+size_t retro_serialize_size(void) { return 2 * sizeof(uint32_t); }
+
+bool retro_serialize(void *data, size_t size)
+{
+    if (size < retro_serialize_size())
+        return false;
+
+    memcpy(data, &test_frame, sizeof test_frame);
+    memcpy((char *)data + sizeof test_frame, &test_hash, sizeof test_hash);
+    return true;
+}
+
+bool retro_unserialize(const void *data, size_t size)
+{
+    if (size < retro_serialize_size())
+        return false;
+
+    memcpy(&test_frame, data, sizeof test_frame);
+    memcpy(&test_hash, (const char *)data + sizeof test_frame, sizeof test_hash);
+    return true;
+}
+
+void retro_cheat_reset(void) {}
+void retro_cheat_set(unsigned index, bool enabled, const char *code) { (void)index; (void)enabled; (void)code; }
+
+bool retro_load_game(const void *game)
+{
+    (void)game;
+
+    int format = 2; /* RETRO_PIXEL_FORMAT_RGB565 */
+    environ_cb(RETRO_ENVIRONMENT_SET_PIXEL_FORMAT, &format);
+
+    /* Registered from the stack, the frontend has to copy it */
+    struct retro_keyboard_callback keyboard = {keyboard_event};
+    environ_cb(RETRO_ENVIRONMENT_SET_KEYBOARD_CALLBACK, &keyboard);
+    *(retro_keyboard_event_t volatile *)&keyboard.callback = NULL;
+
+    retro_reset();
+    memset(test_joypad, 0, sizeof test_joypad);
+    memset(test_keys, 0, sizeof test_keys);
+    memset(test_mouse, 0, sizeof test_mouse);
+    test_key_event_count = 0;
+    return true;
+}
+
+bool retro_load_game_special(unsigned type, const void *info, size_t num) { (void)type; (void)info; (void)num; return false; }
+void retro_unload_game(void) {}
+unsigned retro_get_region(void) { return 0; }
+void *retro_get_memory_data(unsigned id) { (void)id; return NULL; }
+size_t retro_get_memory_size(unsigned id) { (void)id; return 0; }
@@ -0,0 +1,18 @@
+from array import array
+
+from retropy.utils.audio import AudioBuffer
+
+
+def test_single_samples_stay_before_batches():
+    audio = AudioBuffer(capacity=16)
+    write_sample = audio.sample_writer()
+
+    write_sample(1, -1)
+    write_sample(2, -2)
+    batch = array("h", [3, -3, 4, -4])
+    audio.write(batch.buffer_info()[0], 2)
+    write_sample(5, -5)
+    audio.flush()
+
+    expected = array("h", [1, -1, 2, -2, 3, -3, 4, -4, 5, -5])
+    assert bytes(audio.last()) == expected.tobytes()
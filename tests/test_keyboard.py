@@ -0,0 +1,63 @@
+from retropy.core.device.keyboard import Key, Mod
+from retropy.utils.input import Keyboard
+
+A, B, ONE, LSHIFT = range(4)
+
+
+def test_callback_copied_from_stack(core, core_globals):
+    # The core clears its struct right after SET_KEYBOARD_CALLBACK
+    assert core.keyboard.callback
+
+    core.keyboard.press(Key.a)
+    core.frame_advance()
+
+    assert core_globals.key_events == [(0, 1, Key.a.value, 0, 0)]
+
+
+def test_typed_keys_are_pressed_for_a_frame(core, core_globals):
+    start = core_globals.frame
+    core.keyboard.type("aB!")
+
+    for _ in range(8):
+        core.frame_advance()
+
+    assert core_globals.keys(start, start + 7) == [
+        (1, 0, 0, 0),  # a
+        (0, 0, 0, 0),
+        (0, 1, 0, 1),  # shift + b
+        (0, 0, 0, 0),
+        (0, 0, 1, 1),  # shift + 1
+        (0, 0, 0, 0),
+        (0, 0, 0, 0),
+    ]
+
+    shift = Mod.SHIFT.value
+    assert core_globals.key_events == [
+        (start + 0, 1, Key.a.value, ord("a"), 0),
+        (start + 1, 0, Key.a.value, 0, 0),
+        (start + 2, 1, Key.LSHIFT.value, 0, shift),
+        (start + 2, 1, Key.b.value, ord("B"), shift),
+        (start + 3, 0, Key.b.value, 0, shift),
+        (start + 3, 0, Key.LSHIFT.value, 0, 0),
+        (start + 4, 1, Key.LSHIFT.value, 0, shift),
+        (start + 4, 1, Key.K1.value, ord("!"), shift),
+        (start + 5, 0, Key.K1.value, 0, shift),
+        (start + 5, 0, Key.LSHIFT.value, 0, 0),
+    ]
+
+
+def test_key_map_changes_when_flushed(core):
+    core.keyboard[Key.b] = 1
+    assert core.keyboard[Key.b] == 0
+
+    core.frame_advance()
+    assert core.keyboard[Key.b] == 1
+
+
+def test_state_keeps_codes_without_key():
+    keyboard = Keyboard()
+    keyboard.press(Key.a)
+    keyboard.press(5)
+    keyboard.poll()
+
+    assert keyboard.state == {Key.a: 1, 5: 1}
@@ -0,0 +1,142 @@
+from retropy import RetroPy
+from retropy.core.device import Device
+from retropy.core.device.keyboard import Key
+from retropy.utils.input import GamePadInput, InputDevice, Mouse
+
+import pytest
+
+
+class PollDrivenRetroPy(RetroPy):
+    """Sets input while the core polls, like the pygame frontend."""
+
+    script: list[list[GamePadInput]] = []
+
+    def input_poll(self):
+        frame = self.frames_polled = getattr(self, "frames_polled", 0) + 1
+        pressed = self.script[frame % len(self.script)] if self.script else []
+
+        for input in (GamePadInput.A, GamePadInput.B, GamePadInput.START):
+            self.controllers[0][input] = int(input in pressed)
+
+        super().input_poll()
+
+
+def test_closed_movie_is_detached(core, tmp_path):
+    with core.record_movie(str(tmp_path / "movie.rpym"), savestate=False) as movie:
+        for _ in range(10):
+            core.frame_advance()
+
+    # More frames than a chunk holds would flush into the closed file
+    for _ in range(movie.chunk_frames + 10):
+        core.frame_advance()
+
+    assert core.movie is None
+    assert movie.frames == 10
+
+
+def test_stop_movie(core, tmp_path):
+    movie = core.record_movie(str(tmp_path / "movie.rpym"))
+    core.frame_advance()
+    core.stop_movie()
+
+    assert core.movie is None
+    assert movie.closed
+
+
+@pytest.mark.parametrize("savestate", [True, False])
+def test_replay_matches_poll_driven_input(
+    core_path, core_globals, rom, tmp_path, savestate
+):
+    path = str(tmp_path / "movie.rpym")
+
+    core = PollDrivenRetroPy(core_path)
+    core.script = [[GamePadInput.A], [], [GamePadInput.B, GamePadInput.START], []]
+    core.load(rom)
+    core.set_controller(0)
+
+    for _ in range(5):
+        core.frame_advance()
+
+    with core.record_movie(path, savestate=savestate):
+        start = core_globals.frame
+        for _ in range(700):
+            core.frame_advance()
+
+    recorded_hash = core_globals.hash
+    recorded = core_globals.joypad(start, start + 700)
+    assert any(recorded)
+
+    # Different live input during replay must not leak into it
+    core.script = [[GamePadInput.START]]
+    for _ in core.replay_movie(path, render=False):
+        pass
+
+    assert core_globals.hash == recorded_hash
+    assert core_globals.joypad(start, start + 700) == recorded
+
+
+def test_live_input_after_replay(core, core_globals, tmp_path):
+    path = str(tmp_path / "movie.rpym")
+    pad = core.controllers[0]
+
+    pad[GamePadInput.A] = 1
+    core.keyboard.press(Key.b)
+    with core.record_movie(path):
+        for _ in range(3):
+            core.frame_advance()
+
+    pad[GamePadInput.A] = 0
+    core.keyboard.release(Key.b)
+    core.frame_advance()
+
+    for _ in core.replay_movie(path, render=False):
+        pass
+    assert core_globals.joypad(core_globals.frame - 1, core_globals.frame) == [256]
+
+    core.frame_advance()
+    frame = core_globals.frame - 1
+
+    assert pad[GamePadInput.A] == 0
+    assert core_globals.joypad(frame, frame + 1) == [0]
+    assert core_globals.keys(frame, frame + 1) == [(0, 0, 0, 0)]
+    assert core.keyboard[Key.b] == 0
+
+
+def test_replay_mouse_and_keyboard(core, core_globals, tmp_path):
+    path = str(tmp_path / "movie.rpym")
+    mouse = core.set_controller(1, Device.MOUSE)
+
+    with core.record_movie(path, savestate=False):
+        start = core_globals.frame
+        core.keyboard.type("ab")
+        for frame in range(20):
+            mouse.move(frame - 10, 2 * frame)
+            core.frame_advance()
+
+    recorded_hash = core_globals.hash
+    recorded_mouse = core_globals.mouse(start, start + 20)
+    recorded_keys = core_globals.keys(start, start + 20)
+    assert any(x or y for x, y in recorded_mouse)
+    assert any(any(keys) for keys in recorded_keys)
+
+    # Ports are switched back to the recorded devices, live typing waits for the replay
+    core.set_controller(1, Device.JOYPAD)
+    core.keyboard.type("1")
+    for _ in core.replay_movie(path, render=False):
+        pass
+
+    assert isinstance(core.controllers[1], Mouse)
+    assert core_globals.hash == recorded_hash
+    assert core_globals.mouse(start, start + 20) == recorded_mouse
+    assert core_globals.keys(start, start + 20) == recorded_keys
+
+
+def test_unsupported_device_is_not_recorded(core, tmp_path):
+    class Wheel(InputDevice):
+        pass
+
+    core.set_controller(1, Device.JOYPAD, Wheel())
+
+    with pytest.raises(ValueError):
+        core.record_movie(str(tmp_path / "movie.rpym"))
+    assert core.movie is None